@@ -1,414 +1,523 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Query
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from datetime import datetime, timedelta
-from typing import Optional
+from pathlib import Path
+from typing import Optional, Dict, List, Tuple, AsyncIterator, Iterable
+from collections import OrderedDict
+from functools import lru_cache
+from operator import itemgetter
+import asyncio
+import heapq
+import os
+import re
+import time
 
-from ..services.json_storage import JSONStorage
+import aiofiles
+import orjson
+import pandas as pd
+
+from ..services.clients import storage
 from ..services.report_generator import ReportGenerator
 from ..models.reports import CurrentRecommendations, ReportRequest
 from ..config import settings
 
 router = APIRouter(prefix="/api/v1/reports", tags=["reports"])
 
-storage = JSONStorage()
-report_generator = ReportGenerator()
+
+@lru_cache()
+def get_report_generator() -> ReportGenerator:
+    """Shared report generator, created on first use.
+
+    Building it pulls in the LLM analyzer and investment advisor, which only
+    the summary generation endpoint needs.
+    """
+    return ReportGenerator()
+
+
+_DATE_RE = re.compile(r"^[0-9]{4}-(0[1-9]|1[0-2])-(0[1-9]|[12][0-9]|3[01])$")
+
+SUMMARIES_DIR = Path("data/summaries")
+LATEST_SUMMARY_TTL = 5  # seconds
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Latest summary per report kinds: {kinds: {"dir_mtime", "path", "raw", "payload", "ts"}}
+_latest_cache: Dict[Tuple[str, ...], Dict] = {}
+
+DAILY_CACHE_SIZE = 512
+TODAY_CACHE_TTL = 60  # seconds
+
+# Reports for past dates never change, so they are kept in an LRU; today's
+# report may still be (re)generated and only gets a short TTL
+_daily_cache: "OrderedDict[str, Dict]" = OrderedDict()
+_today_cache = {"date": None, "report": None, "ts": 0.0}
+
+LAST_GOOD_TTL = 60  # seconds
+
+# Date of the last daily report found by the "most recent report" lookup
+_last_good = {"date": None, "ts": 0.0}
+
+
+# Recommendation defaults: (symbol, allocation, reasoning, confidence)
+_STABLE_DEFAULTS = ("N/A", settings.stable_investment, "No reasoning available", 0.5)
+_RISKY_DEFAULTS = ("N/A", settings.risky_investment, "No reasoning available", 0.5)
+
+
+@lru_cache(maxsize=4)
+def _parse_iso(value: str) -> datetime:
+    """Parse an ISO datetime; the same few report dates repeat across requests"""
+    return datetime.fromisoformat(value)
+
+
+def _build_rec(rec: Dict, defaults: Tuple) -> Dict:
+    """Build a recommendation response dict, filling in missing fields"""
+    return {
+        "symbol": rec.get('symbol', defaults[0]),
+        "allocation": rec.get('allocation', defaults[1]),
+        "reasoning": rec.get('reasoning', defaults[2]),
+        "confidence": rec.get('confidence', defaults[3]),
+        "expected_return_30d": rec.get('expected_return_30d'),
+        "max_risk": rec.get('max_risk')
+    }
+
+
+async def _read_file_bytes(path: Path) -> bytes:
+    """Read a file without blocking the event loop"""
+    async with aiofiles.open(path, 'rb') as f:
+        return await f.read()
+
+
+async def _read_json_file(path: Path) -> Dict:
+    """Read and decode a JSON file without blocking the event loop"""
+    return orjson.loads(await _read_file_bytes(path))
+
+
+@lru_cache(maxsize=64)
+def _summary_file(report_id: str) -> Path:
+    """Path of a summary report file, memoized for frequently requested ids"""
+    return SUMMARIES_DIR / f"{report_id}.json"
+
+
+def _envelope(raw_report: bytes, **fields) -> bytes:
+    """Wrap an already-encoded report as {"report": ..., **fields}.
+
+    Report files on disk are valid JSON, so they are spliced in as-is rather
+    than decoded and re-encoded.
+    """
+    return b'{"report":' + raw_report + b',' + orjson.dumps(fields)[1:]
+
+
+async def _stream_envelope(f, **fields) -> AsyncIterator[bytes]:
+    """Stream an open report file wrapped as {"report": ..., **fields}"""
+    try:
+        yield b'{"report":'
+        while chunk := await f.read(STREAM_CHUNK_SIZE):
+            yield chunk
+        yield b',' + orjson.dumps(fields)[1:]
+    finally:
+        await f.close()
+
+
+def _find_latest(kinds: Tuple[str, ...]) -> Optional[Path]:
+    """Look up the most recent summary file of the given kinds in the index"""
+    latest_file = storage.get_latest_summary_path(kinds)
+
+    # Reindex if the index is empty or points at a file that was removed
+    if latest_file is None or not latest_file.exists():
+        if storage.rebuild_summary_index():
+            latest_file = storage.get_latest_summary_path(kinds)
+
+    return latest_file
+
+
+async def _get_latest_summary(kinds: Tuple[str, ...]) -> Optional[Tuple[Path, bytes, Dict]]:
+    """Find and load the most recent summary report of the given kinds (SR/MR).
+
+    The result is reused while the summaries directory mtime is unchanged and
+    the entry is younger than LATEST_SUMMARY_TTL, so warm requests skip the
+    index lookup and the file read. A new report changes the directory mtime
+    and is seen at once; a report rewritten in place does not, and is only
+    picked up once the entry expires.
+    """
+    dir_mtime = (await asyncio.to_thread(os.stat, SUMMARIES_DIR)).st_mtime
+    cached = _latest_cache.get(kinds)
+    if (cached and cached["dir_mtime"] == dir_mtime
+            and time.monotonic() - cached["ts"] < LATEST_SUMMARY_TTL):
+        return cached["path"], cached["raw"], cached["payload"]
+
+    # The index lookup is blocking sqlite I/O, so keep it off the event loop
+    latest_file = await asyncio.to_thread(_find_latest, kinds)
+    if latest_file is None:
+        return None
+
+    raw = await _read_file_bytes(latest_file)
+    payload = orjson.loads(raw)
+
+    _latest_cache[kinds] = {
+        "dir_mtime": dir_mtime,
+        "path": latest_file,
+        "raw": raw,
+        "payload": payload,
+        "ts": time.monotonic()
+    }
+    return latest_file, raw, payload
+
+
+def _date_str(dt: datetime) -> str:
+    """Format a datetime as YYYY-MM-DD without going through strftime"""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+
+
+async def _cached_daily(date: str) -> Optional[Dict]:
+    """Get a daily report, serving repeated lookups from memory"""
+    today = _date_str(datetime.now())
+
+    if date >= today:
+        if (_today_cache["date"] == date
+                and time.monotonic() - _today_cache["ts"] < TODAY_CACHE_TTL):
+            return _today_cache["report"]
+        report = await storage.get_daily_report(date)
+        _today_cache.update(date=date, report=report, ts=time.monotonic())
+        return report
+
+    report = _daily_cache.get(date)
+    if report is not None:
+        _daily_cache.move_to_end(date)
+        return report
+
+    report = await storage.get_daily_report(date)
+    if report:
+        _daily_cache[date] = report
+        if len(_daily_cache) > DAILY_CACHE_SIZE:
+            _daily_cache.popitem(last=False)
+    return report
+
+
+async def _get_recent_daily_report(now: datetime) -> Optional[Dict]:
+    """Get today's daily report, falling back to yesterday's.
+
+    The date that last produced a report is tried first for LAST_GOOD_TTL
+    seconds, so a missing "today" is re-probed at most once a minute.
+    """
+    if _last_good["date"] and time.monotonic() - _last_good["ts"] < LAST_GOOD_TTL:
+        report = await _cached_daily(_last_good["date"])
+        if report:
+            return report
+
+    for date in (_date_str(now), _date_str(now - timedelta(days=1))):
+        report = await _cached_daily(date)
+        if report:
+            _last_good.update(date=date, ts=time.monotonic())
+            return report
+
+    return None
+
+
+async def _get_summary_reports_since(start: datetime) -> List[Dict]:
+    """Get summary reports covering periods that end since start, reading all files concurrently"""
+    paths = await asyncio.to_thread(storage.get_summary_paths_since, start.date().isoformat())
+    results = await asyncio.gather(*(_read_json_file(p) for p in paths), return_exceptions=True)
+
+    # Skip files removed since they were indexed
+    return [report for report in results if not isinstance(report, Exception)]
+
+
+def _top3(symbols: Iterable[str]) -> List[Tuple[str, int]]:
+    """Three most frequent symbols with their counts, most frequent first"""
+    counts: Dict[str, int] = {}
+    for symbol in symbols:
+        counts[symbol] = counts.get(symbol, 0) + 1
+    return heapq.nlargest(3, counts.items(), key=itemgetter(1))
+
+
+def _date_range(start: datetime, end: datetime) -> List[str]:
+    """List YYYY-MM-DD strings from start to end, inclusive"""
+    return [
+        _date_str(start + timedelta(days=i))
+        for i in range((end.date() - start.date()).days + 1)
+    ]
+
+
+async def _get_daily_reports_range(start: datetime, end: datetime) -> List[Dict]:
+    """Get daily reports within a date range, fetching all dates concurrently"""
+    reports = await asyncio.gather(*(_cached_daily(d) for d in _date_range(start, end)))
+    return [report for report in reports if report]
 
 
 @router.get("/daily/latest")
 async def get_latest_daily_report():
     """Get the most recent daily report"""
-    try:
-        # Try today first, then yesterday
-        today = datetime.now().strftime("%Y-%m-%d")
-        report = await storage.get_daily_report(today)
-        
-        if not report:
-            yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-            report = await storage.get_daily_report(yesterday)
-            
-            if not report:
-                raise HTTPException(
-                    status_code=404,
-                    detail="No recent daily reports available"
-                )
-        
-        return {
-            "report": report,
-            "retrieved_at": datetime.now().isoformat()
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
+    # Try today first, then yesterday
+    now = datetime.now()
+    report = await _get_recent_daily_report(now)
+    
+    if not report:
         raise HTTPException(
-            status_code=500,
-            detail=f"Error retrieving latest report: {str(e)}"
+            status_code=404,
+            detail="No recent daily reports available"
         )
+    
+    return {
+        "report": report,
+        "retrieved_at": now.isoformat()
+    }
 
 
 @router.get("/daily/{date}")
 async def get_daily_report(date: str):
     """Get daily report for a specific date (YYYY-MM-DD format)"""
-    try:
-        # Validate date format
-        try:
-            datetime.strptime(date, "%Y-%m-%d")
-        except ValueError:
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid date format. Use YYYY-MM-DD"
-            )
-        
-        report = await storage.get_daily_report(date)
-        
-        if not report:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Daily report not found for {date}"
-            )
-        
-        return {
-            "report": report,
-            "retrieved_at": datetime.now().isoformat()
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
+    # Validate date format
+    if not _DATE_RE.match(date):
         raise HTTPException(
-            status_code=500,
-            detail=f"Error retrieving daily report: {str(e)}"
+            status_code=400,
+            detail="Invalid date format. Use YYYY-MM-DD"
         )
+    
+    report = await _cached_daily(date)
+    
+    if not report:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Daily report not found for {date}"
+        )
+    
+    return {
+        "report": report,
+        "retrieved_at": datetime.now().isoformat()
+    }
 
 
 @router.post("/summary")
 async def generate_summary_report(
     background_tasks: BackgroundTasks,
-    request: ReportRequest
+    request: ReportRequest,
+    report_generator: ReportGenerator = Depends(get_report_generator)
 ):
     """Generate a summary report for the specified date range"""
-    try:
-        # Validate date range
-        if request.start_date >= request.end_date:
-            raise HTTPException(
-                status_code=400,
-                detail="Start date must be before end date"
-            )
-        
-        # Check if date range is not too large (max 60 days)
-        date_diff = (request.end_date - request.start_date).days
-        if date_diff > 60:
-            raise HTTPException(
-                status_code=400,
-                detail="Date range cannot exceed 60 days"
-            )
-        
-        # Generate report in background
-        start_date_str = request.start_date.strftime("%Y-%m-%d")
-        end_date_str = request.end_date.strftime("%Y-%m-%d")
-        
-        # For now, generate synchronously. In production, use background tasks
-        summary_report = await report_generator.create_summary_report(
-            start_date_str, end_date_str
+    # Validate date range
+    if request.start_date >= request.end_date:
+        raise HTTPException(
+            status_code=400,
+            detail="Start date must be before end date"
         )
-        
-        return {
-            "message": "Summary report generated successfully",
-            "report_id": summary_report.report_id,
-            "report": summary_report.model_dump(),
-            "generated_at": datetime.now().isoformat()
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
+    
+    # Check if date range is not too large (max 60 days)
+    date_diff = (request.end_date - request.start_date).days
+    if date_diff > 60:
         raise HTTPException(
-            status_code=500,
-            detail=f"Error generating summary report: {str(e)}"
+            status_code=400,
+            detail="Date range cannot exceed 60 days"
         )
+    
+    # Generate report in background
+    start_date_str = request.start_date.strftime("%Y-%m-%d")
+    end_date_str = request.end_date.strftime("%Y-%m-%d")
+    
+    # For now, generate synchronously. In production, use background tasks
+    summary_report = await report_generator.create_summary_report(
+        start_date_str, end_date_str
+    )
+    
+    # Let pydantic-core encode the report straight to JSON bytes rather than
+    # building an intermediate dict tree for orjson to walk again
+    return Response(
+        content=_envelope(
+            summary_report.model_dump_json().encode(),
+            message="Summary report generated successfully",
+            report_id=summary_report.report_id,
+            generated_at=datetime.now().isoformat()
+        ),
+        media_type="application/json"
+    )
 
 
 @router.get("/summary/latest")
 async def get_latest_summary_report():
     """Get the latest summary report"""
-    try:
-        from pathlib import Path
-        import json
-        import os
-        
-        summaries_dir = Path("data/summaries")
-        if not summaries_dir.exists():
-            raise HTTPException(
-                status_code=404,
-                detail="No summary reports directory found"
-            )
-        
-        # Find the most recent summary report (both SR_ and MR_ files)
-        summary_files = list(summaries_dir.glob("*R_*.json"))
-        if not summary_files:
-            raise HTTPException(
-                status_code=404,
-                detail="No summary reports found"
-            )
-        
-        # Sort by modification time and get the latest
-        latest_file = max(summary_files, key=os.path.getmtime)
-        
-        with open(latest_file, 'r') as f:
-            summary_report = json.load(f)
-        
-        return {
-            "report": summary_report,
-            "file_path": str(latest_file),
-            "generated_at": summary_report.get('generated_at'),
-            "retrieved_at": datetime.now().isoformat()
-        }
-        
-    except Exception as e:
+    if not await asyncio.to_thread(SUMMARIES_DIR.exists):
         raise HTTPException(
-            status_code=500,
-            detail=f"Error retrieving latest summary report: {str(e)}"
+            status_code=404,
+            detail="No summary reports directory found"
         )
+    
+    # Find the most recent summary report (both SR_ and MR_ files)
+    latest = await _get_latest_summary(("SR", "MR"))
+    if not latest:
+        raise HTTPException(
+            status_code=404,
+            detail="No summary reports found"
+        )
+    
+    latest_file, raw_report, summary_report = latest
+    
+    return Response(
+        content=_envelope(
+            raw_report,
+            file_path=str(latest_file),
+            generated_at=summary_report.get('generated_at'),
+            retrieved_at=datetime.now().isoformat()
+        ),
+        media_type="application/json"
+    )
 
 
 @router.get("/summary/{report_id}")
 async def get_summary_report(report_id: str):
     """Get a specific summary report"""
+    # Look for the summary report file
+    report_file = _summary_file(report_id)
+    
     try:
-        # Look for the summary report file
-        from pathlib import Path
-        report_file = Path("data/summaries") / f"{report_id}.json"
-        
-        if not report_file.exists():
-            raise HTTPException(
-                status_code=404,
-                detail=f"Summary report {report_id} not found"
-            )
-        
-        import json
-        with open(report_file, 'r') as f:
-            report = json.load(f)
-        
-        return {
-            "report": report,
-            "retrieved_at": datetime.now().isoformat()
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
+        f = await aiofiles.open(report_file, 'rb')
+    except FileNotFoundError:
         raise HTTPException(
-            status_code=500,
-            detail=f"Error retrieving summary report: {str(e)}"
+            status_code=404,
+            detail=f"Summary report {report_id} not found"
         )
+    
+    # Stream the file straight through instead of parsing and re-encoding it
+    return StreamingResponse(
+        _stream_envelope(f, retrieved_at=datetime.now().isoformat()),
+        media_type="application/json"
+    )
 
 
-@router.get("/current-recommendations")
+@router.get("/current-recommendations", response_model=CurrentRecommendations)
 async def get_current_recommendations():
     """Get current investment recommendations"""
-    try:
-        # Get latest daily report
-        today = datetime.now().strftime("%Y-%m-%d")
-        report = await storage.get_daily_report(today)
-        
-        if not report:
-            # Try yesterday
-            yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-            report = await storage.get_daily_report(yesterday)
-            
-            if not report:
-                raise HTTPException(
-                    status_code=404,
-                    detail="No recent recommendations available"
-                )
-        
-        # Extract recommendations
-        stable_rec = report.get('stable_recommendation', {})
-        risky_rec = report.get('risky_recommendation', {})
-        market_overview = report.get('market_overview', {})
-        
-        recommendations = CurrentRecommendations(
-            date=datetime.fromisoformat(report['date']),
-            stable_recommendation={
-                "symbol": stable_rec.get('symbol', 'N/A'),
-                "allocation": stable_rec.get('allocation', settings.stable_investment),
-                "reasoning": stable_rec.get('reasoning', 'No reasoning available'),
-                "confidence": stable_rec.get('confidence', 0.5),
-                "expected_return_30d": stable_rec.get('expected_return_30d')
-            },
-            risky_recommendation={
-                "symbol": risky_rec.get('symbol', 'N/A'),
-                "allocation": risky_rec.get('allocation', settings.risky_investment),
-                "reasoning": risky_rec.get('reasoning', 'No reasoning available'),
-                "confidence": risky_rec.get('confidence', 0.5),
-                "expected_return_30d": risky_rec.get('expected_return_30d')
-            },
-            market_context=market_overview.get('market_sentiment', 'Unknown market conditions')
-        )
-        
-        return recommendations.model_dump()
-        
-    except HTTPException:
-        raise
-    except Exception as e:
+    # Get latest daily report (today, else yesterday)
+    report = await _get_recent_daily_report(datetime.now())
+    
+    if not report:
         raise HTTPException(
-            status_code=500,
-            detail=f"Error retrieving current recommendations: {str(e)}"
+            status_code=404,
+            detail="No recent recommendations available"
         )
+    
+    # Extract recommendations
+    stable_rec = report.get('stable_recommendation', {})
+    risky_rec = report.get('risky_recommendation', {})
+    market_overview = report.get('market_overview', {})
+    
+    # Build the response directly; the inputs come from our own stored
+    # reports, so pydantic validation would only re-check known-good data
+    return ORJSONResponse({
+        "date": _parse_iso(report['date']),
+        "stable_recommendation": _build_rec(stable_rec, _STABLE_DEFAULTS),
+        "risky_recommendation": _build_rec(risky_rec, _RISKY_DEFAULTS),
+        "market_context": market_overview.get('market_sentiment', 'Unknown market conditions')
+    })
 
 
 @router.get("/history")
 async def get_reports_history(
-    days: int = 30,
+    days: int = Query(default=30, ge=1, le=365, description="Number of days to retrieve"),
     report_type: str = "DAILY"
 ):
     """Get history of reports"""
-    try:
-        if report_type.upper() not in ["DAILY", "SUMMARY"]:
-            raise HTTPException(
-                status_code=400,
-                detail="Report type must be 'DAILY' or 'SUMMARY'"
-            )
-        
-        # Calculate date range
-        end_date = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-        
-        # Get reports from JSON storage
-        if report_type.upper() == "DAILY":
-            reports = await storage.get_daily_reports_range(start_date, end_date)
-        else:
-            # For summary reports, we'd need to implement a similar range query
-            # For now, return empty list
-            reports = []
-        
-        return {
-            "report_type": report_type.upper(),
-            "period_days": days,
-            "total_reports": len(reports),
-            "reports": reports
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
+    if report_type.upper() not in ["DAILY", "SUMMARY"]:
         raise HTTPException(
-            status_code=500,
-            detail=f"Error retrieving reports history: {str(e)}"
+            status_code=400,
+            detail="Report type must be 'DAILY' or 'SUMMARY'"
         )
+    
+    # Calculate date range
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=days)
+    
+    # Get reports from JSON storage
+    if report_type.upper() == "DAILY":
+        reports = await _get_daily_reports_range(start_date, end_date)
+    else:
+        reports = await _get_summary_reports_since(start_date)
+    
+    return {
+        "report_type": report_type.upper(),
+        "period_days": days,
+        "total_reports": len(reports),
+        "reports": reports
+    }
 
 
 @router.get("/performance")
 async def get_performance_summary():
     """Get performance summary of recommendations"""
-    try:
-        # Get last 30 days of daily reports
-        end_date = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
-        
-        reports = await storage.get_daily_reports_range(start_date, end_date)
-        
-        if not reports:
-            return {
-                "message": "No reports available for performance analysis",
-                "period": "30 days",
-                "total_reports": 0
-            }
-        
-        # Analyze performance metrics
-        stable_symbols = []
-        risky_symbols = []
-        confidence_scores = []
-        
-        for report in reports:
-            if 'stable_recommendation' in report:
-                stable_rec = report['stable_recommendation']
-                stable_symbols.append(stable_rec.get('symbol'))
-                confidence_scores.append(stable_rec.get('confidence', 0.5))
-            
-            if 'risky_recommendation' in report:
-                risky_rec = report['risky_recommendation']
-                risky_symbols.append(risky_rec.get('symbol'))
-                confidence_scores.append(risky_rec.get('confidence', 0.5))
-        
-        # Calculate statistics
-        from collections import Counter
-        stable_counts = Counter(stable_symbols)
-        risky_counts = Counter(risky_symbols)
-        
-        avg_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0
-        
+    # Get last 30 days of daily reports
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=30)
+    
+    reports = await _get_daily_reports_range(start_date, end_date)
+    
+    if not reports:
         return {
+            "message": "No reports available for performance analysis",
             "period": "30 days",
-            "total_reports": len(reports),
-            "average_confidence": round(avg_confidence, 3),
-            "most_recommended": {
-                "stable": stable_counts.most_common(3),
-                "risky": risky_counts.most_common(3)
-            },
-            "system_reliability": len(reports) / 30 * 100  # Percentage of days with reports
+            "total_reports": 0
         }
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error calculating performance summary: {str(e)}"
-        )
-
+    
+    # Analyze performance metrics: one row per recommendation
+    recommendations = pd.DataFrame(
+        [
+            (category, rec.get('symbol'), rec.get('confidence', 0.5))
+            for report in reports
+            for category in ("stable", "risky")
+            if (rec := report.get(f"{category}_recommendation")) is not None
+        ],
+        columns=["category", "symbol", "confidence"]
+    )
+    
+    # Calculate statistics
+    def most_common(category: str) -> List[Tuple[str, int]]:
+        return _top3(recommendations.loc[recommendations["category"] == category, "symbol"])
+    
+    avg_confidence = float(recommendations["confidence"].mean()) if not recommendations.empty else 0
+    
+    return {
+        "period": "30 days",
+        "total_reports": len(reports),
+        "average_confidence": round(avg_confidence, 3),
+        "most_recommended": {
+            "stable": most_common("stable"),
+            "risky": most_common("risky")
+        },
+        "system_reliability": len(reports) / 30 * 100  # Percentage of days with reports
+    }
 
 
 @router.get("/summary/latest/ai-recommendations")
 async def get_latest_ai_recommendations():
     """Get AI recommendations from the latest summary report"""
-    try:
-        # Get the most recent summary report
-        from pathlib import Path
-        import json
-        import os
-        
-        summaries_dir = Path("data/summaries")
-        if not summaries_dir.exists():
-            raise HTTPException(
-                status_code=404,
-                detail="No summary reports directory found"
-            )
-        
-        # Find the most recent summary report
-        summary_files = list(summaries_dir.glob("SR_*.json"))
-        if not summary_files:
-            raise HTTPException(
-                status_code=404,
-                detail="No summary reports found"
-            )
-        
-        # Sort by modification time and get the latest
-        latest_file = max(summary_files, key=os.path.getmtime)
-        
-        with open(latest_file, 'r') as f:
-            summary_report = json.load(f)
-        
-        # Extract AI recommendations
-        ai_stable = summary_report.get('ai_stable_recommendation')
-        ai_risky = summary_report.get('ai_risky_recommendation')
-        
-        if not ai_stable and not ai_risky:
-            raise HTTPException(
-                status_code=404,
-                detail="No AI recommendations found in latest summary report"
-            )
-        
-        return {
-            "report_id": summary_report.get('report_id'),
-            "generated_at": summary_report.get('end_date'),
-            "days_analyzed": summary_report.get('days_analyzed', 0),
-            "ai_stable_recommendation": ai_stable,
-            "ai_risky_recommendation": ai_risky,
-            "retrieved_at": datetime.now().isoformat()
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
+    # Get the most recent summary report
+    if not await asyncio.to_thread(SUMMARIES_DIR.exists):
+        raise HTTPException(
+            status_code=404,
+            detail="No summary reports directory found"
+        )
+    
+    # Find the most recent summary report
+    latest = await _get_latest_summary(("SR",))
+    if not latest:
         raise HTTPException(
-            status_code=500,
-            detail=f"Error retrieving AI recommendations: {str(e)}"
-        )
\ No newline at end of file
+            status_code=404,
+            detail="No summary reports found"
+        )
+    
+    _, _, summary_report = latest
+    
+    # Extract AI recommendations
+    ai_stable = summary_report.get('ai_stable_recommendation')
+    ai_risky = summary_report.get('ai_risky_recommendation')
+    
+    if not ai_stable and not ai_risky:
+        raise HTTPException(
+            status_code=404,
+            detail="No AI recommendations found in latest summary report"
+        )
+    
+    return {
+        "report_id": summary_report.get('report_id'),
+        "generated_at": summary_report.get('end_date'),
+        "days_analyzed": summary_report.get('days_analyzed', 0),
+        "ai_stable_recommendation": ai_stable,
+        "ai_risky_recommendation": ai_risky,
+        "retrieved_at": datetime.now().isoformat()
+    }
\ No newline at end of file
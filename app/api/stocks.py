@@ -1,208 +1,192 @@
-from fastapi import APIRouter, HTTPException, Query
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+"""Stock endpoints.
 
-from ..services.json_storage import JSONStorage
-from ..services.data_collector import DataCollector
-from ..models.stock_data import StockData
+Handlers return plain dicts straight from storage and leave encoding to
+ORJSONResponse; validate with StockData at the storage layer, not here.
+"""
+from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi.responses import ORJSONResponse
+from datetime import datetime
+from typing import Optional
+from functools import lru_cache
+import heapq
+import re
+
+from ..services.clients import storage, data_collector
+from ..services.cache import cached
 
 router = APIRouter(prefix="/api/v1/stocks", tags=["stocks"])
 
-storage = JSONStorage()
-data_collector = DataCollector()
+# Category path values mapped to their watchlist keys
+_CATEGORY_KEYS = {"STABLE": "stable", "RISKY": "risky"}
+
+_SYMBOL_RE = re.compile(r"^[A-Z][A-Z0-9.\-]{0,9}$")
+
+
+@lru_cache(maxsize=512)
+def _normalize_symbol(symbol: str) -> Optional[str]:
+    """Uppercase a ticker, returning None if it is not a valid symbol"""
+    normalized = symbol.upper()
+    return normalized if _SYMBOL_RE.match(normalized) else None
+
+
+async def normalized_symbol(symbol: str) -> str:
+    """Validate and uppercase the symbol path parameter before any storage access"""
+    normalized = _normalize_symbol(symbol)
+    if normalized is None:
+        raise HTTPException(status_code=400, detail=f"Invalid symbol: {symbol}")
+    return normalized
 
 
 @router.get("/{symbol}/analysis")
-async def get_stock_analysis(symbol: str):
+@cached("stock-analysis", ttl=300)
+async def get_stock_analysis(symbol: str = Depends(normalized_symbol)):
     """Get detailed analysis of a specific stock"""
-    try:
-        # Get latest stock data from JSON storage
-        stock_data = await storage.get_latest_stock_data(symbol.upper())
-        
-        if not stock_data:
-            raise HTTPException(
-                status_code=404, 
-                detail=f"No analysis data found for {symbol.upper()}"
-            )
-        
-        return {
-            "symbol": symbol.upper(),
-            "last_updated": stock_data.get("date"),
-            "data": stock_data
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
+    # Get latest stock data from JSON storage
+    stock_data = await storage.get_latest_stock_data(symbol)
+    
+    if not stock_data:
         raise HTTPException(
-            status_code=500, 
-            detail=f"Error retrieving stock analysis: {str(e)}"
+            status_code=404, 
+            detail=f"No analysis data found for {symbol}"
         )
+    
+    return {
+        "symbol": symbol,
+        "last_updated": stock_data.get("date"),
+        "data": stock_data
+    }
 
 
 @router.get("/{symbol}/history")
 async def get_stock_history(
-    symbol: str,
-    days: int = Query(default=30, ge=1, le=365, description="Number of days to retrieve")
+    symbol: str = Depends(normalized_symbol),
+    days: int = Query(default=30, ge=1, le=365, description="Number of days to retrieve"),
+    fields: Optional[str] = Query(default=None, description="Comma-separated fields to include (e.g. price_data,technical_indicators)")
 ):
     """Get historical analysis data for a stock"""
-    try:
-        # Get historical data from JSON storage
-        history = await storage.get_stock_history(symbol.upper(), days)
-        
-        return {
-            "symbol": symbol.upper(),
-            "period_days": days,
-            "data_points": len(history),
-            "history": history
-        }
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error retrieving stock history: {str(e)}"
-        )
+    # Get historical data from JSON storage
+    history = await storage.get_stock_history(symbol, days)
+    
+    # Drop unrequested fields (AI analysis, news, ...) before serialization
+    if fields:
+        wanted = {f.strip() for f in fields.split(",")} | {"date"}
+        history = [{k: v for k, v in point.items() if k in wanted} for point in history]
+    
+    return ORJSONResponse({
+        "symbol": symbol,
+        "period_days": days,
+        "data_points": len(history),
+        "history": history
+    })
 
 
 @router.get("/watchlist")
+@cached("watchlist", ttl=3600)
 async def get_watchlist():
     """Get the complete stock watchlist"""
-    try:
-        watchlist = await data_collector.get_watchlist()
-        
-        return {
-            "total_stocks": len(watchlist["stable"]) + len(watchlist["risky"]),
-            "stable_stocks": {
-                "count": len(watchlist["stable"]),
-                "symbols": watchlist["stable"]
-            },
-            "risky_stocks": {
-                "count": len(watchlist["risky"]),
-                "symbols": watchlist["risky"]
-            },
-            "last_updated": watchlist.get("last_updated")
-        }
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error retrieving watchlist: {str(e)}"
-        )
+    watchlist = await data_collector.get_watchlist()
+    
+    return {
+        "total_stocks": len(watchlist["stable"]) + len(watchlist["risky"]),
+        "stable_stocks": {
+            "count": len(watchlist["stable"]),
+            "symbols": watchlist["stable"]
+        },
+        "risky_stocks": {
+            "count": len(watchlist["risky"]),
+            "symbols": watchlist["risky"]
+        },
+        "last_updated": watchlist.get("last_updated")
+    }
 
 
 @router.get("/categories/{category}")
 async def get_stocks_by_category(category: str):
     """Get all stocks in a specific category (stable or risky)"""
-    try:
-        category_upper = category.upper()
-        if category_upper not in ["STABLE", "RISKY"]:
-            raise HTTPException(
-                status_code=400,
-                detail="Category must be either 'stable' or 'risky'"
-            )
-        
-        watchlist = await data_collector.get_watchlist()
-        category_key = "stable" if category_upper == "STABLE" else "risky"
-        symbols = watchlist[category_key]
-        
-        # Get latest data for all symbols in category
-        latest_data = []
-        for symbol in symbols:
-            stock_data = await storage.get_latest_stock_data(symbol)
-            if stock_data:
-                latest_data.append(stock_data)
-        
-        return {
-            "category": category_upper,
-            "total_symbols": len(symbols),
-            "symbols_with_data": len(latest_data),
-            "stocks": latest_data
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
+    category_upper = category.upper()
+    category_key = _CATEGORY_KEYS.get(category_upper)
+    if category_key is None:
         raise HTTPException(
-            status_code=500,
-            detail=f"Error retrieving stocks by category: {str(e)}"
+            status_code=400,
+            detail="Category must be either 'stable' or 'risky'"
         )
+    
+    watchlist = await data_collector.get_watchlist()
+    symbols = watchlist[category_key]
+    
+    # Get latest data for all symbols in category
+    latest_data = await storage.get_latest_batch(symbols)
+    
+    return ORJSONResponse({
+        "category": category_upper,
+        "total_symbols": len(symbols),
+        "symbols_with_data": len(latest_data),
+        "stocks": latest_data
+    })
 
 
 @router.get("/trending")
+@cached("trending", ttl=60)
 async def get_trending_stocks(
     limit: int = Query(default=10, ge=1, le=50, description="Number of stocks to return")
 ):
     """Get trending stocks based on recent price movements"""
-    try:
-        # Get latest data from today
-        today = datetime.now().strftime("%Y-%m-%d")
-        stocks_today = await storage.get_stocks_by_date(today)
-        
-        # Sort by change percentage and limit results
-        trending_stocks = sorted(
-            stocks_today, 
-            key=lambda x: x.get('price_data', {}).get('change_percent', 0), 
-            reverse=True
-        )[:limit]
-        
-        trending = []
-        for stock_data in trending_stocks:
-            trending.append({
-                "symbol": stock_data['symbol'],
-                "change_percent": stock_data['price_data']['change_percent'],
-                "current_price": stock_data['price_data']['close'],
-                "volume": stock_data['price_data']['volume'],
-                "category": stock_data['category'],
-                "last_updated": stock_data['date']
-            })
-        
-        return {
-            "trending_stocks": trending,
-            "last_updated": datetime.now().isoformat()
-        }
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error retrieving trending stocks: {str(e)}"
-        )
+    # Get latest data from today
+    now = datetime.now()
+    stocks_today = await storage.get_stocks_by_date(now.date().isoformat())
+    
+    # Keep only the top movers by change percentage
+    trending_stocks = heapq.nlargest(
+        limit,
+        stocks_today,
+        key=lambda x: x.get('price_data', {}).get('change_percent', 0) or 0
+    )
+    
+    trending = []
+    for stock_data in trending_stocks:
+        price_data = stock_data.get('price_data', {})
+        trending.append({
+            "symbol": stock_data['symbol'],
+            "change_percent": price_data.get('change_percent'),
+            "current_price": price_data.get('close'),
+            "volume": price_data.get('volume'),
+            "category": stock_data.get('category'),
+            "last_updated": stock_data.get('date')
+        })
+    
+    return ORJSONResponse({
+        "trending_stocks": trending,
+        "last_updated": now.isoformat()
+    })
 
 
 @router.get("/{symbol}/recommendation")
-async def get_stock_recommendation(symbol: str):
+@cached("stock-recommendation", ttl=300)
+async def get_stock_recommendation(symbol: str = Depends(normalized_symbol)):
     """Get current AI recommendation for a specific stock"""
-    try:
-        stock_data = await storage.get_latest_stock_data(symbol.upper())
-        
-        if not stock_data:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No data found for {symbol.upper()}"
-            )
-        
-        ai_analysis = stock_data.get('ai_analysis')
-        if not ai_analysis:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No AI analysis available for {symbol.upper()}"
-            )
-        
-        return {
-            "symbol": symbol.upper(),
-            "recommendation": ai_analysis.get('recommendation'),
-            "confidence_level": ai_analysis.get('confidence_level'),
-            "target_allocation": ai_analysis.get('target_allocation'),
-            "price_target_30d": ai_analysis.get('price_target_30d'),
-            "risk_score": ai_analysis.get('risk_score'),
-            "key_factors": ai_analysis.get('key_factors', []),
-            "reasoning": ai_analysis.get('reasoning'),
-            "last_analyzed": stock_data.get('date')
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
+    stock_data = await storage.get_latest_stock_data(symbol)
+    
+    if not stock_data:
         raise HTTPException(
-            status_code=500,
-            detail=f"Error retrieving recommendation: {str(e)}"
-        )
\ No newline at end of file
+            status_code=404,
+            detail=f"No data found for {symbol}"
+        )
+    
+    ai_analysis = stock_data.get('ai_analysis')
+    if not ai_analysis:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No AI analysis available for {symbol}"
+        )
+    
+    return {
+        "symbol": symbol,
+        "recommendation": ai_analysis.get('recommendation'),
+        "confidence_level": ai_analysis.get('confidence_level'),
+        "target_allocation": ai_analysis.get('target_allocation'),
+        "price_target_30d": ai_analysis.get('price_target_30d'),
+        "risk_score": ai_analysis.get('risk_score'),
+        "key_factors": ai_analysis.get('key_factors', []),
+        "reasoning": ai_analysis.get('reasoning'),
+        "last_analyzed": stock_data.get('date')
+    }
\ No newline at end of file
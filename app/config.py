@@ -22,6 +22,7 @@ class Settings(BaseSettings):
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     debug: bool = False
+    cors_origins: List[str] = ["*"]  # e.g. CORS_ORIGINS='["https://dashboard.example.com"]'
     
     # Stock collection settings
     max_stable_stocks: int = 25
@@ -33,9 +34,12 @@ class Settings(BaseSettings):
     risky_investment: int = 50
     
     # Analysis Configuration
+    max_concurrent: int = 5  # symbols collected in parallel
     analysis_timeout: int = 30  # seconds per stock
     max_news_articles: int = 10
     confidence_threshold: float = 0.6
+    rule_confidence_threshold: float = 0.8  # skip the LLM when technical signals agree this strongly
+    min_candidates: int = 3  # stop fetching market data once this many candidates succeed
     
     class Config:
         env_file = ".env"
@@ -1,14 +1,22 @@
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
+from pathlib import Path
+import asyncio
+import hashlib
 import logging
+import time
+
+import orjson
 
 from .config import settings
 from .api import stocks, reports
-from .services.json_storage import JSONStorage
-from .services.data_collector import DataCollector
+from .services.clients import storage, data_collector, close_clients
+from .services.cache import cached
 from .services.llm_adapter import llm_adapter
 
 # Configure logging
@@ -18,90 +26,185 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize services on startup and release them on shutdown"""
+    logger.info("Trading Bot API starting up...")
+
+    # Load existing stock lists (without triggering internet updates), check
+    # storage health and index summary reports concurrently
+    loaded, health, _ = await asyncio.gather(
+        data_collector.stock_collector.load_lists_from_file(),
+        asyncio.to_thread(storage.get_health_status),
+        asyncio.to_thread(storage.rebuild_summary_index),
+        return_exceptions=True
+    )
+
+    if isinstance(loaded, Exception):
+        logger.warning(f"Could not load existing stock lists: {str(loaded)}")
+    elif loaded:
+        current_lists = data_collector.stock_collector.get_current_lists()
+        logger.info(f"Loaded existing stock lists: {len(current_lists['stable'])} stable, {len(current_lists['risky'])} risky stocks")
+        if current_lists.get('last_updated'):
+            logger.info(f"Stock lists last updated: {current_lists['last_updated']}")
+    else:
+        logger.info("No existing stock lists found - will be updated during first daily analysis")
+
+    logger.info(f"Investment allocation: ${settings.stable_investment} stable, ${settings.risky_investment} risky")
+
+    if isinstance(health, Exception):
+        logger.warning(f"Storage system issue: {str(health)}")
+    else:
+        logger.info(f"JSON storage status: {health.get('status', 'unknown')}")
+
+    yield
+
+    logger.info("Trading Bot API shutting down...")
+
+    # Optional: perform cleanup tasks
+    try:
+        # Clean up old data if needed
+        await storage.cleanup_old_data()
+    except Exception as e:
+        logger.warning(f"Cleanup warning: {str(e)}")
+
+    # Release pooled HTTP and Redis connections
+    await close_clients()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Trading Bot API",
     description="Automated stock analysis and investment recommendation system",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
+    allow_origins=settings.cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Compress larger JSON payloads (history, category and report listings)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Settings are loaded once at startup, so values derived from them are built once too
+_STRATEGY = f"${settings.stable_investment} stable + ${settings.risky_investment} risky"
+_INVESTMENT_ALLOCATION = {
+    "stable_amount": settings.stable_investment,
+    "risky_amount": settings.risky_investment,
+    "total_monthly": settings.stable_investment + settings.risky_investment
+}
+_ANALYSIS_SETTINGS = {
+    "confidence_threshold": settings.confidence_threshold,
+    "rule_confidence_threshold": settings.rule_confidence_threshold,
+    "max_news_articles": settings.max_news_articles,
+    "analysis_timeout": settings.analysis_timeout,
+    "max_stable_stocks": settings.max_stable_stocks,
+    "max_risky_stocks": settings.max_risky_stocks
+}
+
+WATCHLIST_TTL = 60  # seconds
+
+# Watchlist shared by /health, /config and /status; lists change at most daily
+_watchlist_cache = {"value": None, "expires": 0.0}
+_watchlist_lock = asyncio.Lock()
+
+
+async def _cached_watchlist():
+    """Get the watchlist, reusing the last result for WATCHLIST_TTL seconds"""
+    if time.monotonic() < _watchlist_cache["expires"]:
+        return _watchlist_cache["value"]
+
+    # Only one request refreshes on expiry; the rest wait and reuse its result
+    async with _watchlist_lock:
+        if time.monotonic() >= _watchlist_cache["expires"]:
+            _watchlist_cache["value"] = await data_collector.get_watchlist()
+            _watchlist_cache["expires"] = time.monotonic() + WATCHLIST_TTL
+        return _watchlist_cache["value"]
+
+
 # Include routers
 app.include_router(stocks.router)
 app.include_router(reports.router)
 
 # Mount static files for the web UI (if directory exists)
-import os
-if os.path.exists("static"):
+if Path("static").is_dir():
     app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# Initialize services
-storage = JSONStorage()
-data_collector = DataCollector()
+
+# The UI files and the API description don't change while the app runs, so
+# resolve and serialize them once instead of on every request
+_UI_INDEX = next(
+    (path for path in (Path('static/index.html'), Path('app/templates/dashboard.html')) if path.is_file()),
+    None
+)
+
+_ROOT_FALLBACK_BYTES = orjson.dumps({
+    "message": "Trading Bot API",
+    "version": "1.0.0",
+    "description": "Automated stock analysis and investment recommendations",
+    "note": "Web UI not available - templates not found",
+    "endpoints": {
+        "docs": "/docs",
+        "stocks": "/api/v1/stocks",
+        "reports": "/api/v1/reports",
+        "health": "/health"
+    }
+})
+
+_API_INFO_BYTES = orjson.dumps({
+    "message": "Trading Bot API",
+    "version": "1.0.0",
+    "description": "Automated stock analysis and investment recommendations",
+    "endpoints": {
+        "docs": "/docs",
+        "stocks": "/api/v1/stocks",
+        "reports": "/api/v1/reports",
+        "health": "/health",
+        "ui": "/"
+    }
+})
 
 
 @app.get("/")
 async def root():
     """Serve the main UI"""
-    if os.path.exists('static/index.html'):
-        return FileResponse('static/index.html')
-    elif os.path.exists('app/templates/dashboard.html'):
-        return FileResponse('app/templates/dashboard.html')
-    else:
-        return {
-            "message": "Trading Bot API",
-            "version": "1.0.0",
-            "description": "Automated stock analysis and investment recommendations",
-            "note": "Web UI not available - templates not found",
-            "endpoints": {
-                "docs": "/docs",
-                "stocks": "/api/v1/stocks",
-                "reports": "/api/v1/reports",
-                "health": "/health"
-            }
-        }
+    if _UI_INDEX:
+        return FileResponse(_UI_INDEX)
+    return Response(_ROOT_FALLBACK_BYTES, media_type="application/json")
+
 
 @app.get("/api")
 async def api_info():
     """API information endpoint"""
-    return {
-        "message": "Trading Bot API",
-        "version": "1.0.0",
-        "description": "Automated stock analysis and investment recommendations",
-        "endpoints": {
-            "docs": "/docs",
-            "stocks": "/api/v1/stocks",
-            "reports": "/api/v1/reports",
-            "health": "/health",
-            "ui": "/"
-        }
-    }
+    return Response(_API_INFO_BYTES, media_type="application/json")
 
 
 @app.get("/health")
+@cached("health", ttl=15)
 async def health_check():
     """Health check endpoint"""
+    now = datetime.now()
     try:
-        # Check JSON storage health
-        storage_health = storage.get_health_status()
-
-        # Get current watchlist info
-        watchlist = await data_collector.get_watchlist()
+        # Check JSON storage health and get current watchlist info concurrently
+        storage_health, watchlist = await asyncio.gather(
+            asyncio.to_thread(storage.get_health_status),
+            _cached_watchlist()
+        )
 
         # Basic system health
         system_health = {
             "status": "healthy",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "services": {
                 "api": "operational",
                 "storage": storage_health.get("status", "unknown"),
@@ -110,8 +213,8 @@ async def health_check():
             "configuration": {
                 "stable_stocks_count": len(watchlist["stable"]),
                 "risky_stocks_count": len(watchlist["risky"]),
-                "stable_allocation": settings.stable_investment,
-                "risky_allocation": settings.risky_investment,
+                "stable_allocation": _INVESTMENT_ALLOCATION["stable_amount"],
+                "risky_allocation": _INVESTMENT_ALLOCATION["risky_amount"],
                 "stock_lists_last_updated": watchlist.get("last_updated")
             }
         }
@@ -130,7 +233,7 @@ async def health_check():
             detail={
                 "status": "unhealthy",
                 "error": str(e),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now.isoformat()
             }
         )
 
@@ -138,6 +241,7 @@ async def health_check():
 @app.get("/api/v1/llm/test")
 async def test_llm_providers():
     """Test LLM provider connectivity"""
+    now_iso = datetime.now().isoformat()
     try:
         provider_status = llm_adapter.get_provider_status()
         connection_tests = await llm_adapter.test_connection()
@@ -145,7 +249,7 @@ async def test_llm_providers():
         return {
             "provider_status": provider_status,
             "connection_tests": connection_tests,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso
         }
     except Exception as e:
         logger.error(f"LLM test failed: {str(e)}")
@@ -154,58 +258,101 @@ async def test_llm_providers():
             detail={
                 "error": "LLM test failed",
                 "details": str(e),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso
             }
         )
 
 
+def _make_etag(*parts) -> str:
+    """Build a weak ETag from the values a response is derived from"""
+    digest = hashlib.blake2s(":".join(map(str, parts)).encode(), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _with_etag(result, etag: str) -> Response:
+    """Attach an ETag to a handler result (dict or prebuilt response)"""
+    response = result if isinstance(result, Response) else ORJSONResponse(result)
+    response.headers["ETag"] = etag
+    return response
+
+
+# Serialized /config body, its ETag and the stock list version it was built from
+_config_body = {"version": None, "body": b"", "etag": None}
+
+
 @app.get("/api/v1/config")
-async def get_config():
+async def get_config(request: Request):
     """Get system configuration (non-sensitive data only)"""
-    watchlist = await data_collector.get_watchlist()
-
-    return {
-        "watchlist": {
-            "stable_stocks": watchlist["stable"],
-            "risky_stocks": watchlist["risky"],
-            "last_updated": watchlist.get("last_updated")
-        },
-        "investment_allocation": {
-            "stable_amount": settings.stable_investment,
-            "risky_amount": settings.risky_investment,
-            "total_monthly": settings.stable_investment + settings.risky_investment
-        },
-        "analysis_settings": {
-            "confidence_threshold": settings.confidence_threshold,
-            "max_news_articles": settings.max_news_articles,
-            "analysis_timeout": settings.analysis_timeout,
-            "max_stable_stocks": settings.max_stable_stocks,
-            "max_risky_stocks": settings.max_risky_stocks
-        }
-    }
+    # Make sure the lists are loaded before checking their version
+    await _cached_watchlist()
+
+    stock_collector = data_collector.stock_collector
+    if _config_body["version"] != stock_collector.version:
+        watchlist = stock_collector.get_current_lists()
+        _config_body["body"] = orjson.dumps({
+            "watchlist": {
+                "stable_stocks": watchlist["stable"],
+                "risky_stocks": watchlist["risky"],
+                "last_updated": watchlist.get("last_updated")
+            },
+            "investment_allocation": _INVESTMENT_ALLOCATION,
+            "analysis_settings": _ANALYSIS_SETTINGS
+        })
+        # Hash the content, not the version: the version counter is per
+        # process and restarts with it
+        _config_body["etag"] = _make_etag("config", _config_body["body"])
+        _config_body["version"] = stock_collector.version
+
+    etag = _config_body["etag"]
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    return _with_etag(Response(_config_body["body"], media_type="application/json"), etag)
 
 
 @app.get("/api/v1/status")
-async def get_system_status():
+async def get_system_status(request: Request):
     """Get detailed system status"""
-    try:
-        # Get recent analysis data
-        today = datetime.now().strftime("%Y-%m-%d")
-        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+    # Status only meaningfully changes when the stock lists or the latest
+    # daily reports do, so let polling clients revalidate against those
+    # before any of the payload is built
+    watchlist = await _cached_watchlist()
+    today = datetime.now().date()
+    todays_mtime, yesterdays_mtime = await asyncio.gather(
+        asyncio.to_thread(storage.get_daily_report_mtime, today.isoformat()),
+        asyncio.to_thread(storage.get_daily_report_mtime, (today - timedelta(days=1)).isoformat())
+    )
+    etag = _make_etag("status", watchlist.get("last_updated"), todays_mtime, yesterdays_mtime)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    return _with_etag(await _system_status(etag=etag), etag)
 
-        # Check for today's report
-        todays_report = await storage.get_daily_report(today)
-        yesterdays_report = await storage.get_daily_report(yesterday)
 
-        # Get storage stats
-        storage_stats = await storage.get_storage_stats()
-        storage_health = storage.get_health_status()
+@cached("status", ttl=30)
+async def _system_status(etag: str):
+    """Build the detailed system status payload.
 
-        # Get current watchlist
-        watchlist = await data_collector.get_watchlist()
+    ``etag`` is part of the cache key, so a cached body is only ever served
+    under the ETag it was built for.
+    """
+    now = datetime.now()
+    try:
+        # Get recent analysis data
+        today = now.date()
+
+        # Today's/yesterday's reports, storage stats/health and the watchlist are
+        # independent, so fetch them all at once
+        todays_report, yesterdays_report, storage_stats, storage_health, watchlist = await asyncio.gather(
+            storage.get_daily_report(today.isoformat()),
+            storage.get_daily_report((today - timedelta(days=1)).isoformat()),
+            storage.get_storage_stats(),
+            asyncio.to_thread(storage.get_health_status),
+            _cached_watchlist()
+        )
 
         return {
-            "system_time": datetime.now().isoformat(),
+            "system_time": now.isoformat(),
             "analysis_status": {
                 "todays_report_available": todays_report is not None,
                 "yesterdays_report_available": yesterdays_report is not None,
@@ -215,89 +362,54 @@ async def get_system_status():
             "storage_stats": storage_stats,
             "api_configuration": {
                 "total_tracked_stocks": len(watchlist["stable"]) + len(watchlist["risky"]),
-                "investment_strategy": f"${settings.stable_investment} stable + ${settings.risky_investment} risky",
+                "investment_strategy": _STRATEGY,
                 "stock_lists_last_updated": watchlist.get("last_updated")
             }
         }
 
     except Exception as e:
         logger.error(f"Status check failed: {str(e)}")
-        return {
-            "error": str(e),
-            "system_time": datetime.now().isoformat(),
-            "status": "error"
-        }
+        # Raised rather than returned so the response cache doesn't keep it
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "error": str(e),
+                "system_time": now.isoformat(),
+                "status": "error"
+            }
+        )
 
 
 # Error handlers
-@app.exception_handler(404)
-async def not_found_handler(request: Request, exc):
-    return JSONResponse(
-        status_code=404,
-        content={
-            "error": "Not Found",
-            "message": "The requested resource was not found",
-            "timestamp": datetime.now().isoformat()
-        }
-    )
-
-
-@app.exception_handler(500)
-async def internal_error_handler(request: Request, exc):
-    logger.error(f"Internal server error: {str(exc)}")
-    return JSONResponse(
-        status_code=500,
-        content={
-            "error": "Internal Server Error",
-            "message": "An unexpected error occurred",
-            "timestamp": datetime.now().isoformat()
-        }
-    )
+# Error bodies are constant apart from the trailing timestamp, so only that is
+# encoded per response
+_NOT_FOUND_PREFIX = orjson.dumps({
+    "error": "Not Found",
+    "message": "The requested resource was not found"
+})[:-1] + b',"timestamp":"'
 
+_INTERNAL_ERROR_PREFIX = orjson.dumps({
+    "detail": "Internal server error",
+    "error": "Internal Server Error",
+    "message": "An unexpected error occurred"
+})[:-1] + b',"timestamp":"'
 
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    """Initialize services on startup"""
-    logger.info("Trading Bot API starting up...")
 
-    # Check for existing stock lists (non-blocking)
-    try:
-        # Try to load existing lists without triggering internet updates
-        loaded = await data_collector.stock_collector.load_lists_from_file()
-        if loaded:
-            current_lists = data_collector.stock_collector.get_current_lists()
-            logger.info(f"Loaded existing stock lists: {len(current_lists['stable'])} stable, {len(current_lists['risky'])} risky stocks")
-            if current_lists.get('last_updated'):
-                logger.info(f"Stock lists last updated: {current_lists['last_updated']}")
-        else:
-            logger.info("No existing stock lists found - will be updated during first daily analysis")
-    except Exception as e:
-        logger.warning(f"Could not load existing stock lists: {str(e)}")
+def _error_body(prefix: bytes) -> bytes:
+    """Complete a prebuilt error body with the current timestamp"""
+    return prefix + datetime.now().isoformat().encode() + b'"}'
 
-    logger.info(f"Investment allocation: ${settings.stable_investment} stable, ${settings.risky_investment} risky")
 
-    # Test storage health
-    try:
-        health = storage.get_health_status()
-        logger.info(f"JSON storage status: {health.get('status', 'unknown')}")
-    except Exception as e:
-        logger.warning(f"Storage system issue: {str(e)}")
-
-
-# Shutdown event
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown"""
-    logger.info("Trading Bot API shutting down...")
+@app.exception_handler(404)
+async def not_found_handler(request: Request, exc):
+    return Response(_error_body(_NOT_FOUND_PREFIX), status_code=404, media_type="application/json")
 
-    # Optional: perform cleanup tasks
-    try:
-        # Clean up old data if needed
-        await storage.cleanup_old_data()
-    except Exception as e:
-        logger.warning(f"Cleanup warning: {str(e)}")
 
+@app.exception_handler(Exception)
+async def internal_error_handler(request: Request, exc: Exception):
+    """Single catch-all for unhandled errors raised by any endpoint"""
+    logger.error(f"Unhandled error on {request.method} {request.url.path}: {str(exc)}", exc_info=exc)
+    return Response(_error_body(_INTERNAL_ERROR_PREFIX), status_code=500, media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
@@ -16,11 +16,6 @@ class DailyReport(BaseModel):
     processing_time_minutes: Optional[float] = None
     data_quality_score: Optional[float] = None
     content: str
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 
 class PerformanceMetrics(BaseModel):
@@ -79,11 +74,6 @@ class SummaryReport(BaseModel):
     ai_stable_recommendation: Optional[AIInvestmentRecommendation] = None
     ai_risky_recommendation: Optional[AIInvestmentRecommendation] = None
     content: str
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 
 class ReportRequest(BaseModel):
@@ -96,7 +86,7 @@ class ReportRequest(BaseModel):
     def parse_date(cls, value):
         if isinstance(value, str):
             try:
-                return datetime.strptime(value, "%Y-%m-%d").date()
+                return date.fromisoformat(value)
             except ValueError:
                 raise ValueError("Date must be in YYYY-MM-DD format")
         return value
@@ -106,9 +96,4 @@ class CurrentRecommendations(BaseModel):
     date: datetime
     stable_recommendation: StockRecommendation
     risky_recommendation: StockRecommendation
-    market_context: str
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
\ No newline at end of file
+    market_context: str
\ No newline at end of file
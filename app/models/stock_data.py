@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field
@@ -21,7 +22,11 @@ class Recommendation(str, Enum):
     SELL = "SELL"
 
 
-class PriceData(BaseModel):
+# One per stock per day and only ever built from already-typed values, so a
+# slotted dataclass is used instead of a BaseModel (no per-instance __dict__);
+# pydantic still validates it when it arrives as a dict inside StockData
+@dataclass(slots=True)
+class PriceData:
     open: float
     high: float
     low: float
@@ -84,11 +89,6 @@ class StockData(BaseModel):
     fundamental_data: Optional[FundamentalData] = None
     sentiment_data: Optional[SentimentData] = None
     ai_analysis: Optional[AIAnalysis] = None
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 
 class MarketOverview(BaseModel):
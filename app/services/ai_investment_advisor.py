@@ -1,10 +1,16 @@
 import logging
-import json
 import asyncio
+import math
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+import aiohttp
+import orjson
+import pandas as pd
 import yfinance as yf
-import requests
 
 from ..config import settings
 from ..models.reports import AIInvestmentRecommendation, TopPerformer, SummaryReport
@@ -12,16 +18,152 @@ from ..models.stock_data import StockData, StockCategory
 from .analyzer import LLMAnalyzer
 from .data_collector import DataCollector
 from .json_storage import JSONStorage
+from .rate_limit import RateLimiter
+from .yf_cache import TTL_HISTORY_5D, TTL_INFO, TTL_RECOMMENDATIONS, cached_fetch, load, store
 
 logger = logging.getLogger(__name__)
 
+# Headline words that signal news sentiment
+POSITIVE_WORDS = frozenset({
+    'beat', 'exceeds', 'strong', 'growth', 'profit', 'gain', 'rise', 'up', 
+    'bull', 'surge', 'rally', 'outperform', 'upgrade', 'buy', 'positive'
+})
+NEGATIVE_WORDS = frozenset({
+    'miss', 'disappoints', 'weak', 'decline', 'loss', 'fall', 'down', 
+    'bear', 'crash', 'drop', 'underperform', 'downgrade', 'sell', 'negative'
+})
+# One alternation per polarity so matching runs inside the regex engine
+_POSITIVE_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, sorted(POSITIVE_WORDS))) + r")\b")
+_NEGATIVE_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, sorted(NEGATIVE_WORDS))) + r")\b")
+
+# LLM replies often wrap the JSON object in a ```json ... ``` fence
+_JSON_EXTRACT = re.compile(r"^\s*(?:```(?:json)?)?\s*(\{.*\})\s*(?:```)?\s*$", re.DOTALL)
+
+
+@lru_cache(maxsize=256)
+def _score_texts(texts: Tuple[str, ...]) -> float:
+    """Average per-article sentiment (0-1), memoized on the article texts"""
+    total_score = 0
+    for text in texts:
+        positive_count = len(_POSITIVE_RE.findall(text))
+        negative_count = len(_NEGATIVE_RE.findall(text))
+        
+        if positive_count + negative_count > 0:
+            score = positive_count / (positive_count + negative_count)
+        else:
+            score = 0.5
+        
+        total_score += score
+    
+    return total_score / len(texts)
+
+
+# Prompt pieces are formatted per call; the text itself is built once at import
+_CANDIDATE_TEMPLATE = """
+Stock: {symbol}
+- Frequency in reports: {frequency} times
+- Current price: {current_price}
+- Daily change: {change_percent}
+- Market cap: {market_cap}
+- P/E ratio: {pe_ratio}
+- Dividend yield: {dividend_yield}
+- Beta: {beta}
+- 52-week range: {week_52_range}
+- Analyst target: {target_price}
+- News sentiment (last 7 days): {news_sentiment}
+- Recent news articles: {news_count}
+"""
+
+_PROMPT_TEMPLATE = """
+You are an investment expert. Analyze the following 30-day stock report and provide an investment recommendation.
+
+## Period Summary:
+- Analysis period: {days_analyzed} days
+- Total recommendations: {total_recommendations}
+- Average confidence level: {avg_confidence:.1%}
+- Market trends: {market_trends}
+
+## Candidates for {category_name} investment (${allocation}):
+
+{candidates}
+
+## Task:
+Select ONE best stock for ${allocation} investment and provide detailed analysis.
+
+## Analysis Criteria:
+1. **Fundamental metrics**: P/E ratio, market capitalization, dividend yield
+2. **Technical analysis**: current position relative to 52-week range
+3. **News background**: sentiment and recent events
+4. **Analyst recommendations**: professional opinions
+5. **Report frequency**: system recommendation stability
+6. **Risk profile**: alignment with {category_name} category
+
+## Response Format (JSON):
+{{
+  "symbol": "TICKER",
+  "reasoning": "Detailed justification with analysis of all factors (3-4 sentences)",
+  "confidence": 0.85,
+  "target_price": 150.00,
+  "expected_return": 0.12,
+  "risk_factors": ["factor 1", "factor 2"],
+  "news_sentiment": "POSITIVE/NEGATIVE/NEUTRAL",
+  "key_metrics": {{
+    "pe_ratio": 25.5,
+    "market_cap": 1000000000,
+    "beta": 1.2
+  }}
+}}
+
+Response must be in JSON format only, without additional text.
+"""
+
+
+def _is_number(value: Any) -> bool:
+    """Check for a finite number; yfinance info can hold strings like 'Infinity'"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def _fmt(value: Any, spec: str, prefix: str = '', suffix: str = '') -> str:
+    """Format an optional prompt metric, using N/A when it is missing or not numeric"""
+    if not _is_number(value):
+        return 'N/A'
+    return f"{prefix}{value:{spec}}{suffix}"
+
+
+# Ticker objects keep their own session and lookup state, so reuse them per symbol
+_ticker_cache: Dict[str, yf.Ticker] = {}
+
+
+def _yf_ticker(symbol: str) -> yf.Ticker:
+    """Get the process-wide yfinance Ticker for a symbol"""
+    ticker = _ticker_cache.get(symbol)
+    if ticker is None:
+        ticker = _ticker_cache[symbol] = yf.Ticker(symbol)
+    return ticker
+
 
 class AIInvestmentAdvisor:
+    # Shared pool for blocking yfinance calls so candidate lookups overlap
+    _executor = ThreadPoolExecutor(max_workers=10, thread_name_prefix="yfinance")
+    
+    # Per-host request budgets, kept under provider limits to avoid 429 backoff
+    _rate_limiters = {
+        "newsapi.org": RateLimiter(rate=1.0),
+        "finance.yahoo.com": RateLimiter(rate=2.0, burst=2)
+    }
+    
     def __init__(self):
         self.analyzer = LLMAnalyzer()
         self.data_collector = DataCollector()
         self.storage = JSONStorage()
         self.news_api_key = settings.news_api_key
+        
+        # Per-category allocation and label, resolved once
+        self._alloc = {
+            StockCategory.STABLE: settings.stable_investment,
+            StockCategory.RISKY: settings.risky_investment
+        }
+        self._cat_name = {StockCategory.STABLE: "stable", StockCategory.RISKY: "risky"}
     
     async def generate_investment_recommendations(
         self, 
@@ -31,15 +173,21 @@ class AIInvestmentAdvisor:
         try:
             logger.info("Generating AI investment recommendations from summary report")
             
-            # Get current market data for top performers
-            stable_candidates = await self._analyze_candidates(
-                summary_report.top_stable_performers, 
-                StockCategory.STABLE
-            )
-            risky_candidates = await self._analyze_candidates(
-                summary_report.top_risky_performers, 
-                StockCategory.RISKY
-            )
+            # Get current market data for top performers, sharing one
+            # HTTP session for all news lookups in this run
+            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as http:
+                stable_candidates, risky_candidates = await asyncio.gather(
+                    self._analyze_candidates(
+                        summary_report.top_stable_performers, 
+                        StockCategory.STABLE,
+                        http
+                    ),
+                    self._analyze_candidates(
+                        summary_report.top_risky_performers, 
+                        StockCategory.RISKY,
+                        http
+                    )
+                )
             
             # Generate AI recommendations for each category
             stable_rec = await self._generate_single_recommendation(
@@ -58,46 +206,152 @@ class AIInvestmentAdvisor:
     async def _analyze_candidates(
         self, 
         performers: List[TopPerformer], 
-        category: StockCategory
+        category: StockCategory,
+        http: aiohttp.ClientSession
     ) -> List[Dict]:
         """Analyze candidate stocks with current market data"""
-        candidates = []
+        performers = performers[:5]  # Analyze top 5 candidates
         
-        for performer in performers[:5]:  # Analyze top 5 candidates
-            try:
-                # Get current stock data
-                stock_data = await self._get_current_stock_data(performer.symbol)
-                if not stock_data:
+        # One Yahoo request for every candidate's recent prices
+        history = await self._run_blocking(
+            self._batch_history, [performer.symbol for performer in performers]
+        )
+        
+        tasks = [
+            asyncio.create_task(self._analyze_candidate(performer, http, history.get(performer.symbol)))
+            for performer in performers
+        ]
+        
+        # Wait on candidates in ranking order, so the best-ranked successes are
+        # kept; once enough have succeeded, keep any lower-ranked ones that have
+        # already finished and stop waiting on the rest
+        candidates = []
+        try:
+            for task in tasks:
+                if len(candidates) >= settings.min_candidates and not task.done():
                     continue
-                
-                # Get recent news sentiment
-                news_data = await self._get_recent_news(performer.symbol)
-                
-                # Get additional market metrics
-                market_metrics = await self._get_market_metrics(performer.symbol)
-                
-                candidates.append({
-                    'symbol': performer.symbol,
-                    'frequency': performer.frequency,
-                    'stock_data': stock_data,
-                    'news_data': news_data,
-                    'market_metrics': market_metrics
-                })
-                
-            except Exception as e:
-                logger.error(f"Error analyzing candidate {performer.symbol}: {str(e)}")
-                continue
+                candidate = await task
+                if candidate:
+                    candidates.append(candidate)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
         
         return candidates
     
-    async def _get_current_stock_data(self, symbol: str) -> Optional[Dict]:
-        """Get current stock data using yfinance"""
+    async def _analyze_candidate(
+        self, 
+        performer: TopPerformer, 
+        http: aiohttp.ClientSession,
+        hist: Optional[pd.DataFrame] = None
+    ) -> Optional[Dict]:
+        """Fetch stock data, news and market metrics for one candidate"""
         try:
-            ticker = yf.Ticker(symbol)
+            (stock_data, market_metrics), news_data = await asyncio.gather(
+                self._fetch_symbol_bundle(performer.symbol, hist),
+                self._get_recent_news(performer.symbol, http)
+            )
+            if not stock_data:
+                return None
             
+            return {
+                'symbol': performer.symbol,
+                'frequency': performer.frequency,
+                'stock_data': stock_data,
+                'news_data': news_data,
+                'market_metrics': market_metrics
+            }
+            
+        except Exception as e:
+            logger.error(f"Error analyzing candidate {performer.symbol}: {str(e)}")
+            return None
+    
+    def _batch_history(self, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+        """Get 5-day history for several symbols, downloading cache misses in one request"""
+        history = {}
+        missing = []
+        for symbol in symbols:
+            hist = load("history_5d", symbol)
+            if hist is None:
+                missing.append(symbol)
+            else:
+                history[symbol] = hist
+        
+        if not missing:
+            return history
+        
+        try:
+            self._rate_limiters["finance.yahoo.com"].wait()
+            frame = yf.download(
+                missing, period="5d", group_by="ticker", threads=True, progress=False
+            )
+        except Exception as e:
+            logger.warning(f"Batch history download failed for {missing}: {str(e)}")
+            return history
+        
+        if frame is None or frame.empty:
+            return history
+        
+        for symbol in missing:
+            if isinstance(frame.columns, pd.MultiIndex):
+                if symbol not in frame.columns.get_level_values(0):
+                    continue
+                hist = frame[symbol].dropna(how="all")
+            else:
+                hist = frame.dropna(how="all")
+            store("history_5d", symbol, TTL_HISTORY_5D, hist)
+            history[symbol] = hist
+        
+        return history
+    
+    async def _run_blocking(self, func: Callable, *args) -> Any:
+        """Run a blocking yfinance call on the shared executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+    
+    def _cached(self, endpoint: str, symbol: str, ttl: int, fetch: Callable[[], Any]) -> Any:
+        """Run a rate-limited yfinance lookup through the file cache"""
+        def rate_limited_fetch():
+            self._rate_limiters["finance.yahoo.com"].wait()
+            return fetch()
+        
+        return cached_fetch(endpoint, symbol, ttl, rate_limited_fetch)
+    
+    async def _fetch_symbol_bundle(
+        self, 
+        symbol: str, 
+        hist: Optional[pd.DataFrame] = None
+    ) -> Tuple[Optional[Dict], Dict]:
+        """Get stock data and market metrics for a symbol in one executor job"""
+        return await self._run_blocking(self._load_symbol_bundle, symbol, hist)
+    
+    def _load_symbol_bundle(
+        self, 
+        symbol: str, 
+        hist: Optional[pd.DataFrame]
+    ) -> Tuple[Optional[Dict], Dict]:
+        """Read quote, fundamentals and analyst data from one shared Ticker"""
+        ticker = _yf_ticker(symbol)
+        stock_data = self._get_current_stock_data(symbol, ticker, hist)
+        if not stock_data:
+            return None, {}
+        return stock_data, self._get_market_metrics(symbol, ticker)
+    
+    def _get_current_stock_data(
+        self, 
+        symbol: str, 
+        ticker: yf.Ticker,
+        hist: Optional[pd.DataFrame] = None
+    ) -> Optional[Dict]:
+        """Get current stock data using yfinance, reusing prefetched history if given"""
+        try:
             # Get historical data with error handling
             try:
-                hist = ticker.history(period="5d")
+                if hist is None:
+                    hist = self._cached(
+                        "history_5d", symbol, TTL_HISTORY_5D, lambda: ticker.history(period="5d")
+                    )
                 if hist.empty:
                     logger.warning(f"No historical data available for {symbol}")
                     return None
@@ -107,7 +361,7 @@ class AIInvestmentAdvisor:
             
             # Get info with error handling for 404s
             try:
-                info = ticker.info
+                info = self._cached("info", symbol, TTL_INFO, lambda: ticker.info)
                 # Sometimes yfinance returns empty dict for invalid symbols
                 if not info or 'regularMarketPrice' not in info and 'currentPrice' not in info:
                     logger.warning(f"No market data available for {symbol} - possibly invalid symbol")
@@ -138,7 +392,7 @@ class AIInvestmentAdvisor:
             logger.error(f"Error getting stock data for {symbol}: {str(e)}")
             return None
     
-    async def _get_recent_news(self, symbol: str) -> Optional[Dict]:
+    async def _get_recent_news(self, symbol: str, http: aiohttp.ClientSession) -> Optional[Dict]:
         """Get recent news and sentiment for stock"""
         if not self.news_api_key:
             return None
@@ -153,16 +407,21 @@ class AIInvestmentAdvisor:
                 'language': 'en',
                 'from': from_date,
                 'sortBy': 'publishedAt',
-                'pageSize': 10,
+                'pageSize': settings.max_news_articles,
                 'apiKey': self.news_api_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
-            if response.status_code != 200:
-                return None
+            await self._rate_limiters[urlparse(url).netloc].acquire()
+            async with http.get(url, params=params, headers={'Accept-Encoding': 'gzip'}) as response:
+                if response.status != 200:
+                    return None
+                data = orjson.loads(await response.read())
             
-            data = response.json()
-            articles = data.get('articles', [])
+            # Keep only the fields scoring and the prompt use
+            articles = [
+                {'title': article.get('title') or '', 'description': article.get('description')}
+                for article in (data.get('articles') or [])[:settings.max_news_articles]
+            ]
             
             # Calculate sentiment score
             sentiment_score = self._calculate_news_sentiment(articles)
@@ -182,36 +441,14 @@ class AIInvestmentAdvisor:
         if not articles:
             return 0.5
         
-        positive_words = [
-            'beat', 'exceeds', 'strong', 'growth', 'profit', 'gain', 'rise', 'up', 
-            'bull', 'surge', 'rally', 'outperform', 'upgrade', 'buy', 'positive'
-        ]
-        negative_words = [
-            'miss', 'disappoints', 'weak', 'decline', 'loss', 'fall', 'down', 
-            'bear', 'crash', 'drop', 'underperform', 'downgrade', 'sell', 'negative'
-        ]
-        
-        total_score = 0
-        for article in articles:
-            text = f"{article.get('title', '')} {article.get('description', '')}'.lower()"
-            
-            positive_count = sum(1 for word in positive_words if word in text)
-            negative_count = sum(1 for word in negative_words if word in text)
-            
-            if positive_count + negative_count > 0:
-                score = positive_count / (positive_count + negative_count)
-            else:
-                score = 0.5
-            
-            total_score += score
-        
-        return total_score / len(articles)
+        return _score_texts(tuple(
+            f"{article.get('title') or ''} {article.get('description') or ''}".lower()
+            for article in articles
+        ))
     
-    async def _get_market_metrics(self, symbol: str) -> Dict:
+    def _get_market_metrics(self, symbol: str, ticker: yf.Ticker) -> Dict:
         """Get additional market metrics"""
         try:
-            ticker = yf.Ticker(symbol)
-            
             metrics = {
                 'analyst_recommendations': None,
                 'recent_upgrades_downgrades': None
@@ -219,7 +456,9 @@ class AIInvestmentAdvisor:
             
             # Get analyst recommendations with error handling
             try:
-                recommendations = ticker.recommendations
+                recommendations = self._cached(
+                    "recommendations", symbol, TTL_RECOMMENDATIONS, lambda: ticker.recommendations
+                )
                 if recommendations is not None and not recommendations.empty:
                     latest_rec = recommendations.tail(1)
                     if not latest_rec.empty:
@@ -235,7 +474,9 @@ class AIInvestmentAdvisor:
             
             # Get upgrades/downgrades with error handling
             try:
-                upgrades_downgrades = ticker.upgrades_downgrades
+                upgrades_downgrades = self._cached(
+                    "upgrades_downgrades", symbol, TTL_INFO, lambda: ticker.upgrades_downgrades
+                )
                 if upgrades_downgrades is not None and not upgrades_downgrades.empty:
                     recent_changes = upgrades_downgrades.tail(3)
                     metrics['recent_upgrades_downgrades'] = recent_changes.to_dict('records')
@@ -258,10 +499,10 @@ class AIInvestmentAdvisor:
         if not candidates:
             return None
         
+        allocation = self._alloc[category]
+        category_name = self._cat_name[category]
+        
         try:
-            allocation = settings.stable_investment if category == StockCategory.STABLE else settings.risky_investment
-            category_name = "stable" if category == StockCategory.STABLE else "risky"
-            
             # Create comprehensive analysis prompt
             prompt = self._create_analysis_prompt(candidates, summary_report, category_name, allocation)
             
@@ -293,83 +534,56 @@ class AIInvestmentAdvisor:
         allocation: int
     ) -> str:
         """Create comprehensive analysis prompt for AI"""
-        
         candidates_data = []
         for candidate in candidates:
             stock_data = candidate['stock_data']
-            news_data = candidate['news_data']
+            news_data = candidate['news_data'] or {}
             market_metrics = candidate['market_metrics']
             
-            candidate_info = f"""
-Stock: {candidate['symbol']}
-- Frequency in reports: {candidate['frequency']} times
-- Current price: ${stock_data.get('current_price', 'N/A'):.2f}
-- Daily change: {stock_data.get('change_percent', 0):.2f}%
-- Market cap: ${stock_data.get('market_cap', 0):,}
-- P/E ratio: {stock_data.get('pe_ratio', 'N/A')}
-- Dividend yield: {(stock_data.get('dividend_yield', 0) or 0)*100:.2f}% if stock_data.get('dividend_yield') is not None else 'N/A'
-- Beta: {stock_data.get('beta', 'N/A')}
-- 52-week range: ${stock_data.get('52_week_low', 0):.2f} - ${stock_data.get('52_week_high', 0):.2f}
-- Analyst target: ${stock_data.get('target_price', 'N/A')}
-- News sentiment (last 7 days): {news_data.get('sentiment_score', 0.5)*100:.0f}%
-- Recent news articles: {news_data.get('articles_count', 0)}
-"""
-            
-            if news_data and news_data.get('latest_headlines'):
-                candidate_info += f"- Latest headlines: {'; '.join(news_data['latest_headlines'][:2])}\n"
+            # yfinance leaves any of these as None, so format each one defensively
+            dividend_yield = stock_data.get('dividend_yield')
+            week_52_low = stock_data.get('52_week_low')
+            week_52_high = stock_data.get('52_week_high')
+            if _is_number(week_52_low) and _is_number(week_52_high):
+                week_52_range = f"${week_52_low:.2f} - ${week_52_high:.2f}"
+            else:
+                week_52_range = 'N/A'
+            
+            candidates_data.append(_CANDIDATE_TEMPLATE.format(
+                symbol=candidate['symbol'],
+                frequency=candidate['frequency'],
+                current_price=_fmt(stock_data.get('current_price'), '.2f', '$'),
+                change_percent=_fmt(stock_data.get('change_percent'), '.2f', suffix='%'),
+                market_cap=_fmt(stock_data.get('market_cap'), ',', '$'),
+                pe_ratio=_fmt(stock_data.get('pe_ratio'), '.2f'),
+                dividend_yield=_fmt(dividend_yield * 100 if _is_number(dividend_yield) else None, '.2f', suffix='%'),
+                beta=_fmt(stock_data.get('beta'), '.2f'),
+                week_52_range=week_52_range,
+                target_price=_fmt(stock_data.get('target_price'), '.2f', '$'),
+                news_sentiment=_fmt(news_data.get('sentiment_score'), '.0%'),
+                news_count=news_data.get('articles_count', 0)
+            ))
+            
+            if news_data.get('latest_headlines'):
+                candidates_data.append(f"- Latest headlines: {'; '.join(news_data['latest_headlines'][:2])}\n")
             
             if market_metrics and market_metrics.get('analyst_recommendations'):
                 recs = market_metrics['analyst_recommendations']
                 total_recs = sum(recs.values())
                 if total_recs > 0:
-                    candidate_info += f"- Analyst ratings: {recs.get('strongBuy', 0)} Strong Buy, {recs.get('buy', 0)} Buy, {recs.get('hold', 0)} Hold\n"
-            
-            candidates_data.append(candidate_info)
+                    candidates_data.append(
+                        f"- Analyst ratings: {recs.get('strongBuy', 0)} Strong Buy, {recs.get('buy', 0)} Buy, {recs.get('hold', 0)} Hold\n"
+                    )
         
-        prompt = f"""
-You are an investment expert. Analyze the following 30-day stock report and provide an investment recommendation.
-
-## Period Summary:
-- Analysis period: {summary_report.days_analyzed} days
-- Total recommendations: {summary_report.performance_metrics.total_recommendations}
-- Average confidence level: {summary_report.performance_metrics.avg_confidence_score:.1%}
-- Market trends: {', '.join(summary_report.market_trends.dominant_themes[:3])}
-
-## Candidates for {category_name} investment (${allocation}):
-
-{''.join(candidates_data)}
-
-## Task:
-Select ONE best stock for ${allocation} investment and provide detailed analysis.
-
-## Analysis Criteria:
-1. **Fundamental metrics**: P/E ratio, market capitalization, dividend yield
-2. **Technical analysis**: current position relative to 52-week range
-3. **News background**: sentiment and recent events
-4. **Analyst recommendations**: professional opinions
-5. **Report frequency**: system recommendation stability
-6. **Risk profile**: alignment with {category_name} category
-
-## Response Format (JSON):
-{{
-  "symbol": "TICKER",
-  "reasoning": "Detailed justification with analysis of all factors (3-4 sentences)",
-  "confidence": 0.85,
-  "target_price": 150.00,
-  "expected_return": 0.12,
-  "risk_factors": ["factor 1", "factor 2"],
-  "news_sentiment": "POSITIVE/NEGATIVE/NEUTRAL",
-  "key_metrics": {{
-    "pe_ratio": 25.5,
-    "market_cap": 1000000000,
-    "beta": 1.2
-  }}
-}}
-
-Response must be in JSON format only, without additional text.
-"""
-        
-        return prompt
+        return _PROMPT_TEMPLATE.format(
+            days_analyzed=summary_report.days_analyzed,
+            total_recommendations=summary_report.performance_metrics.total_recommendations,
+            avg_confidence=summary_report.performance_metrics.avg_confidence_score,
+            market_trends=', '.join(summary_report.market_trends.dominant_themes[:3]),
+            category_name=category_name,
+            allocation=allocation,
+            candidates=''.join(candidates_data)
+        )
     
     async def _parse_ai_response(
         self, 
@@ -379,14 +593,9 @@ Response must be in JSON format only, without additional text.
     ) -> Optional[AIInvestmentRecommendation]:
         """Parse AI response and create recommendation"""
         try:
-            # Clean response and extract JSON
-            response = response.strip()
-            if response.startswith('```json'):
-                response = response[7:]
-            if response.endswith('```'):
-                response = response[:-3]
-            
-            data = json.loads(response.strip())
+            # Extract the JSON object, with or without a ```json fence
+            match = _JSON_EXTRACT.match(response)
+            data = orjson.loads(match.group(1) if match else response)
             
             return AIInvestmentRecommendation(
                 symbol=data['symbol'],
@@ -427,7 +636,7 @@ Response must be in JSON format only, without additional text.
             reasoning=f"Selected {best_candidate['symbol']} as most frequently recommended stock in {category.value.lower()} category with {best_candidate['frequency']} recommendations during analysis period.",
             current_price=stock_data.get('current_price'),
             target_price=stock_data.get('target_price'),
-            expected_return=0.08 if category == StockCategory.STABLE else 0.15,
+            expected_return=0.08 if category is StockCategory.STABLE else 0.15,
             risk_factors=["Market volatility", "Sector-specific risks"],
             news_sentiment=self._sentiment_to_text(news_data.get('sentiment_score', 0.5)),
             key_metrics={
@@ -437,7 +646,9 @@ Response must be in JSON format only, without additional text.
             }
         )
     
-    def _sentiment_to_text(self, score: float) -> str:
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _sentiment_to_text(score: float) -> str:
         """Convert sentiment score to text"""
         if score > 0.6:
             return "POSITIVE"
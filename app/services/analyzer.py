@@ -1,39 +1,242 @@
-import json
+import heapq
 import logging
-from typing import Dict, List, Optional
+import sys
+from collections import Counter
+from itertools import chain
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+import orjson
+from cachetools import TTLCache
+
 from ..config import settings
 from ..models.stock_data import (
-    StockData, AIAnalysis, TrendDirection, Recommendation, StockCategory
+    StockData, AIAnalysis, TrendDirection, Recommendation, StockCategory,
+    TechnicalIndicators, FundamentalData, SentimentData
 )
 from ..models.reports import StockRecommendation, MarketOverview
 from .llm_adapter import llm_adapter
 
 logger = logging.getLogger(__name__)
 
+# Static instructions sent as the system message. Keeping them byte-identical
+# at the start of every request lets providers reuse their cached prefix.
+ANALYSIS_SYSTEM_PROMPT = """You are an expert financial analyst. Analyze the stock data provided by the user.
+
+Provide your analysis in the following JSON format:
+{
+    "trend_direction": "BULLISH|BEARISH|SIDEWAYS",
+    "trend_strength": 0.0-1.0,
+    "risk_score": 0.0-1.0,
+    "recommendation": "BUY|HOLD|SELL",
+    "confidence_level": 0.0-1.0,
+    "target_allocation": "STABLE|RISKY",
+    "price_target_7d": number or null,
+    "price_target_30d": number or null,
+    "support_level": number or null,
+    "resistance_level": number or null,
+    "key_factors": ["factor1", "factor2", "factor3"],
+    "reasoning": "Brief explanation of the analysis and recommendation"
+}
+
+Consider:
+1. Technical momentum and trend strength
+2. Fundamental valuation metrics
+3. Market sentiment and news flow
+4. Risk-adjusted return potential
+5. Stock category (stable vs risky) characteristics
+
+Provide a conservative but actionable analysis.
+"""
+
+# Same instructions plus the batch envelope, so the shared prefix stays cacheable
+BATCH_ANALYSIS_SYSTEM_PROMPT = ANALYSIS_SYSTEM_PROMPT + """
+The user sends several stocks, each in a "### STOCK i: SYMBOL" section. Return
+{"analyses": [...]} with one object per stock in the format above, each with an
+added "symbol" field set to that stock's ticker.
+"""
+
+# JSON schema for one analysis, mirroring the format in ANALYSIS_SYSTEM_PROMPT.
+# Sent as a strict structured-output format so compliant providers return the
+# bare object; values are still clamped by _validate_analysis_data.
+_ANALYSIS_PROPERTIES = {
+    "trend_direction": {"type": "string", "enum": ["BULLISH", "BEARISH", "SIDEWAYS"]},
+    "trend_strength": {"type": "number"},
+    "risk_score": {"type": "number"},
+    "recommendation": {"type": "string", "enum": ["BUY", "HOLD", "SELL"]},
+    "confidence_level": {"type": "number"},
+    "target_allocation": {"type": "string", "enum": ["STABLE", "RISKY"]},
+    "price_target_7d": {"type": ["number", "null"]},
+    "price_target_30d": {"type": ["number", "null"]},
+    "support_level": {"type": ["number", "null"]},
+    "resistance_level": {"type": ["number", "null"]},
+    "key_factors": {"type": "array", "items": {"type": "string"}},
+    "reasoning": {"type": "string"},
+}
+
+
+def _object_schema(properties: Dict) -> Dict:
+    """Build a strict-mode object schema where every property is required"""
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def _json_schema_format(name: str, schema: Dict) -> Dict:
+    """Wrap a schema as an OpenAI-compatible ``response_format``"""
+    return {"type": "json_schema", "json_schema": {"name": name, "strict": True, "schema": schema}}
+
+
+ANALYSIS_RESPONSE_FORMAT = _json_schema_format("stock_analysis", _object_schema(_ANALYSIS_PROPERTIES))
+BATCH_ANALYSIS_RESPONSE_FORMAT = _json_schema_format("stock_analysis_batch", _object_schema({
+    "analyses": {
+        "type": "array",
+        "items": _object_schema({"symbol": {"type": "string"}, **_ANALYSIS_PROPERTIES}),
+    },
+}))
+
+# Confidence reported for analyses that skip the LLM. The vote fraction that
+# gates the skip isn't calibrated against LLM confidence, so rule results sit at
+# the pick threshold and never outrank a more confident LLM analysis.
+RULE_MAX_CONFIDENCE = settings.confidence_threshold
+
+# Stocks per batched LLM call
+ANALYSIS_BATCH_SIZE = 8
+
+# Static report instructions, appended as-is after the day's picks
+_REPORT_PROMPT_SUFFIX = """Create a comprehensive daily report with the following structure:
+
+1. **Market Overview**
+   - Brief assessment of overall market conditions
+   - Key market drivers and themes
+
+2. **Stable Investment Recommendation ($200)**
+   - Primary recommendation with specific reasoning
+   - Entry strategy and key levels to watch
+   - Risk factors to monitor
+
+3. **Risky Investment Recommendation ($50)**
+   - High-potential pick with growth rationale
+   - Expected return potential and timeframe
+   - Maximum risk tolerance
+
+4. **Key Market Risks & Opportunities**
+   - 3-4 major factors affecting the market
+   - Sector rotation opportunities
+   - Economic indicators to watch
+
+5. **Technical & Fundamental Summary**
+   - Market breadth and momentum
+   - Valuation concerns or opportunities
+   - Sentiment indicators
+
+Keep the report actionable, concise, and focused on the specific $200/$50 allocation strategy.
+Include specific price levels and timeframes where relevant.
+"""
+
+# Prompt lines per model field: (attribute, line template, scale, skip zero values)
+_TECH_FIELDS = (
+    ("rsi_14", "- RSI (14): {:.2f}", None, True),
+    ("macd", "- MACD: {:.4f}", None, True),
+    ("sma_20", "- SMA 20: ${:.2f}", None, True),
+    ("sma_50", "- SMA 50: ${:.2f}", None, True),
+    ("bollinger_upper", "- Bollinger Upper: ${:.2f}", None, True),
+    ("bollinger_lower", "- Bollinger Lower: ${:.2f}", None, True),
+)
+_FUNDAMENTAL_FIELDS = (
+    ("pe_ratio", "- P/E Ratio: {:.2f}", None, True),
+    ("market_cap", "- Market Cap: ${:.1f}B", 1e-9, True),
+    ("dividend_yield", "- Dividend Yield: {:.2f}%", 100, False),
+    ("eps_ttm", "- EPS (TTM): ${:.2f}", None, True),
+    ("revenue_growth", "- Revenue Growth: {:.1f}%", 100, False),
+)
+_SENTIMENT_FIELDS = (
+    ("news_sentiment_score", "- News Sentiment: {:.2f}", None, False),
+    ("news_articles_count", "- News Articles: {}", None, True),
+    ("analyst_rating", "- Analyst Rating: {}", None, True),
+)
+
+
+def _find_json_object(text: str) -> Optional[str]:
+    """Return the first balanced {...} in text, ignoring braces inside strings.
+
+    Single pass, so prose or a second object after the JSON is left out.
+    """
+    start = text.find('{')
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+def _format_fields(model: object, fields: tuple) -> List[str]:
+    """Render the populated fields of a data model as prompt lines"""
+    lines = []
+    for attr, template, scale, skip_zero in fields:
+        value = getattr(model, attr)
+        if value is None or (skip_zero and not value):
+            continue
+        lines.append(template.format(value * scale if scale else value))
+    return lines
+
 
 class LLMAnalyzer:
     def __init__(self):
         self.llm_adapter = llm_adapter
+        # Identical prompts within a few minutes reuse the earlier LLM reply
+        self._response_cache = TTLCache(maxsize=256, ttl=300)
         logger.info(f"LLM Analyzer initialized with providers: {self.llm_adapter.get_provider_status()}")
 
     async def analyze_stock_data(self, stock_data: StockData) -> Optional[AIAnalysis]:
-        """Analyze stock data using LLM"""
+        """Analyze stock data using LLM, unless the technical signals already agree"""
         try:
+            rule_analysis, rule_confidence = self._rule_based_analysis(stock_data, RULE_MAX_CONFIDENCE)
+            if rule_confidence >= settings.rule_confidence_threshold:
+                logger.info(f"{stock_data.symbol}: signals agree ({rule_confidence:.0%}), skipping LLM")
+                return rule_analysis
+
             prompt = self._create_analysis_prompt(stock_data)
 
-            response = await self.llm_adapter.chat_completion(
-                prompt=prompt, 
-                temperature=0.3, 
-                max_tokens=1000,
-                timeout=30
-            )
+            response = self._response_cache.get(prompt)
+            if response is None:
+                response = await self.llm_adapter.chat_completion(
+                    prompt=prompt, 
+                    system=ANALYSIS_SYSTEM_PROMPT,
+                    response_format=ANALYSIS_RESPONSE_FORMAT,
+                    temperature=0.3, 
+                    max_tokens=1000,
+                    timeout=30
+                )
+                if response:
+                    self._response_cache[prompt] = response
 
             if response:
-                analysis_data = self._parse_analysis_response(response)
-                if analysis_data:
-                    return AIAnalysis(**analysis_data)
+                analysis = self._parse_analysis_response(response)
+                if analysis:
+                    return analysis
 
             # Fallback analysis if LLM fails
             return self._fallback_analysis(stock_data)
@@ -42,10 +245,63 @@ class LLMAnalyzer:
             logger.error(f"Error analyzing {stock_data.symbol}: {str(e)}")
             return self._fallback_analysis(stock_data)
 
+    async def analyze_stock_batch(self, stocks: List[StockData]) -> Dict[str, AIAnalysis]:
+        """Analyze several stocks with a single LLM call.
+
+        Stocks missing from the batched reply fall back to per-stock analysis.
+        """
+        if not stocks:
+            return {}
+
+        analyses = {}
+        pending = []
+        sections = []
+        for stock in stocks:
+            # A malformed record only falls back for that stock
+            try:
+                rule_analysis, rule_confidence = self._rule_based_analysis(stock, RULE_MAX_CONFIDENCE)
+                if rule_confidence >= settings.rule_confidence_threshold:
+                    analyses[stock.symbol] = rule_analysis
+                    continue
+                sections.append(
+                    f"### STOCK {len(sections) + 1}: {stock.symbol}\n{self._create_analysis_prompt(stock)}"
+                )
+                pending.append(stock)
+            except Exception as e:
+                logger.error(f"Error preparing {stock.symbol} for batch analysis: {str(e)}")
+                analyses[stock.symbol] = self._fallback_analysis(stock)
+
+        if not pending:
+            return analyses
+        stocks = pending
+
+        prompt = "\n".join(sections)
+
+        try:
+            response = await self.llm_adapter.chat_completion(
+                prompt=prompt,
+                system=BATCH_ANALYSIS_SYSTEM_PROMPT,
+                response_format=BATCH_ANALYSIS_RESPONSE_FORMAT,
+                temperature=0.3,
+                max_tokens=600 * len(stocks),
+                timeout=30 + 10 * len(stocks)
+            )
+            if response:
+                analyses.update(self._parse_batch_response(response))
+        except Exception as e:
+            logger.error(f"Error analyzing batch of {len(stocks)} stocks: {str(e)}")
+
+        for stock in stocks:
+            if stock.symbol not in analyses:
+                logger.warning(f"{stock.symbol} missing from batch analysis, analyzing individually")
+                analyses[stock.symbol] = await self.analyze_stock_data(stock)
+
+        return analyses
+
     def _create_analysis_prompt(self, stock_data: StockData) -> str:
-        """Create analysis prompt for LLM"""
+        """Create the per-stock part of the analysis prompt for LLM"""
         return f"""
-You are an expert financial analyst. Analyze the following stock data for {stock_data.symbol}:
+Analyze the following stock data for {stock_data.symbol}:
 
 PRICE DATA:
 - Current Price: ${stock_data.price_data.close:.2f}
@@ -64,139 +320,126 @@ SENTIMENT DATA:
 {self._format_sentiment_data(stock_data.sentiment_data)}
 
 CATEGORY: {stock_data.category.value}
-
-Provide your analysis in the following JSON format:
-{{
-    "trend_direction": "BULLISH|BEARISH|SIDEWAYS",
-    "trend_strength": 0.0-1.0,
-    "risk_score": 0.0-1.0,
-    "recommendation": "BUY|HOLD|SELL",
-    "confidence_level": 0.0-1.0,
-    "target_allocation": "STABLE|RISKY",
-    "price_target_7d": number or null,
-    "price_target_30d": number or null,
-    "support_level": number or null,
-    "resistance_level": number or null,
-    "key_factors": ["factor1", "factor2", "factor3"],
-    "reasoning": "Brief explanation of the analysis and recommendation"
-}}
-
-Consider:
-1. Technical momentum and trend strength
-2. Fundamental valuation metrics
-3. Market sentiment and news flow
-4. Risk-adjusted return potential
-5. Stock category (stable vs risky) characteristics
-
-Provide a conservative but actionable analysis.
 """
 
-    def _format_technical_indicators(self, technical: Optional[object]) -> str:
+    def _format_technical_indicators(self, technical: Optional[TechnicalIndicators]) -> str:
         """Format technical indicators for prompt"""
         if not technical:
             return "- No technical indicators available"
 
-        lines = []
-        if hasattr(technical, 'rsi_14') and technical.rsi_14:
-            lines.append(f"- RSI (14): {technical.rsi_14:.2f}")
-        if hasattr(technical, 'macd') and technical.macd:
-            lines.append(f"- MACD: {technical.macd:.4f}")
-        if hasattr(technical, 'sma_20') and technical.sma_20:
-            lines.append(f"- SMA 20: ${technical.sma_20:.2f}")
-        if hasattr(technical, 'sma_50') and technical.sma_50:
-            lines.append(f"- SMA 50: ${technical.sma_50:.2f}")
-        if hasattr(technical, 'bollinger_upper') and technical.bollinger_upper:
-            lines.append(f"- Bollinger Upper: ${technical.bollinger_upper:.2f}")
-        if hasattr(technical, 'bollinger_lower') and technical.bollinger_lower:
-            lines.append(f"- Bollinger Lower: ${technical.bollinger_lower:.2f}")
-
+        lines = _format_fields(technical, _TECH_FIELDS)
         return '\n'.join(lines) if lines else "- Limited technical data available"
 
-    def _format_fundamental_data(self, fundamental: Optional[object]) -> str:
+    def _format_fundamental_data(self, fundamental: Optional[FundamentalData]) -> str:
         """Format fundamental data for prompt"""
         if not fundamental:
             return "- No fundamental data available"
 
-        lines = []
-        if hasattr(fundamental, 'pe_ratio') and fundamental.pe_ratio:
-            lines.append(f"- P/E Ratio: {fundamental.pe_ratio:.2f}")
-        if hasattr(fundamental, 'market_cap') and fundamental.market_cap:
-            market_cap_b = fundamental.market_cap / 1e9
-            lines.append(f"- Market Cap: ${market_cap_b:.1f}B")
-        if hasattr(fundamental, 'dividend_yield') and fundamental.dividend_yield is not None:
-            lines.append(f"- Dividend Yield: {(fundamental.dividend_yield or 0)*100:.2f}%")
-        if hasattr(fundamental, 'eps_ttm') and fundamental.eps_ttm:
-            lines.append(f"- EPS (TTM): ${fundamental.eps_ttm:.2f}")
-        if hasattr(fundamental, 'revenue_growth') and fundamental.revenue_growth is not None:
-            lines.append(f"- Revenue Growth: {(fundamental.revenue_growth or 0)*100:.1f}%")
-
+        lines = _format_fields(fundamental, _FUNDAMENTAL_FIELDS)
         return '\n'.join(lines) if lines else "- Limited fundamental data available"
 
-    def _format_sentiment_data(self, sentiment: Optional[object]) -> str:
+    def _format_sentiment_data(self, sentiment: Optional[SentimentData]) -> str:
         """Format sentiment data for prompt"""
         if not sentiment:
             return "- No sentiment data available"
 
-        lines = []
-        if hasattr(sentiment, 'news_sentiment_score') and sentiment.news_sentiment_score is not None:
-            lines.append(f"- News Sentiment: {sentiment.news_sentiment_score:.2f}")
-        if hasattr(sentiment, 'news_articles_count') and sentiment.news_articles_count:
-            lines.append(f"- News Articles: {sentiment.news_articles_count}")
-        if hasattr(sentiment, 'analyst_rating') and sentiment.analyst_rating:
-            lines.append(f"- Analyst Rating: {sentiment.analyst_rating}")
-
+        lines = _format_fields(sentiment, _SENTIMENT_FIELDS)
         return '\n'.join(lines) if lines else "- Limited sentiment data available"
 
-    def _parse_analysis_response(self, response: str) -> Optional[Dict]:
-        """Parse LLM response into structured data"""
+    def _extract_json(self, response: str) -> Optional[Dict]:
+        """Extract the JSON object from an LLM response.
+
+        Structured-output replies are the bare object and decode directly;
+        the scan is kept for providers that ignore ``response_format``.
+        """
         try:
-            # Try to extract JSON from response
-            start_idx = response.find('{')
-            end_idx = response.rfind('}')
+            data = orjson.loads(response)
+            if isinstance(data, dict):
+                return data
+        except orjson.JSONDecodeError:
+            pass
 
-            if start_idx != -1 and end_idx != -1:
-                json_str = response[start_idx:end_idx+1]
-                data = json.loads(json_str)
+        json_str = _find_json_object(response)
+        return orjson.loads(json_str) if json_str is not None else None
 
+    def _parse_analysis_response(self, response: str) -> Optional[AIAnalysis]:
+        """Parse LLM response into an analysis"""
+        try:
+            data = self._extract_json(response)
+            if data is not None:
                 # Validate and clean the data
-                return self._validate_analysis_data(data)
+                return self._build_analysis(data)
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON response: {str(e)}")
         except Exception as e:
             logger.error(f"Error parsing analysis response: {str(e)}")
 
         return None
 
+    def _parse_batch_response(self, response: str) -> Dict[str, AIAnalysis]:
+        """Parse a batched LLM response into analyses keyed by symbol"""
+        results = {}
+        try:
+            data = self._extract_json(response) or {}
+            items = data.get('analyses', [])
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Failed to parse batch JSON response: {str(e)}")
+            return results
+        except Exception as e:
+            logger.error(f"Error parsing batch analysis response: {str(e)}")
+            return results
+
+        # A malformed item only drops that stock; the rest of the batch is kept
+        for item in items if isinstance(items, list) else []:
+            if not isinstance(item, dict):
+                continue
+            try:
+                symbol = str(item.get('symbol', '')).upper()
+                if symbol:
+                    results[symbol] = self._build_analysis(item)
+            except Exception as e:
+                logger.error(f"Error parsing batch analysis item: {str(e)}")
+
+        return results
+
+    def _build_analysis(self, data: Dict) -> AIAnalysis:
+        """Build an analysis from raw LLM data.
+
+        _validate_analysis_data already coerces every field to its final type
+        and range, so pydantic validation is skipped.
+        """
+        return AIAnalysis.model_construct(**self._validate_analysis_data(data))
+
     def _validate_analysis_data(self, data: Dict) -> Dict:
-        """Validate and clean analysis data"""
+        """Validate and clean analysis data into AIAnalysis field values"""
         validated = {}
 
         # Validate trend_direction
         trend = data.get('trend_direction', 'SIDEWAYS').upper()
         if trend in ['BULLISH', 'BEARISH', 'SIDEWAYS']:
-            validated['trend_direction'] = trend
+            validated['trend_direction'] = TrendDirection(trend)
         else:
-            validated['trend_direction'] = 'SIDEWAYS'
+            validated['trend_direction'] = TrendDirection.SIDEWAYS
 
         # Validate numeric fields
-        validated['trend_strength'] = max(0, min(1, data.get('trend_strength', 0.5)))
-        validated['risk_score'] = max(0, min(1, data.get('risk_score', 0.5)))
-        validated['confidence_level'] = max(0, min(1, data.get('confidence_level', 0.5)))
+        validated['trend_strength'] = float(max(0, min(1, data.get('trend_strength', 0.5))))
+        validated['risk_score'] = float(max(0, min(1, data.get('risk_score', 0.5))))
+        validated['confidence_level'] = float(max(0, min(1, data.get('confidence_level', 0.5))))
 
         # Validate recommendation
         rec = data.get('recommendation', 'HOLD').upper()
         if rec in ['BUY', 'HOLD', 'SELL']:
-            validated['recommendation'] = rec
+            validated['recommendation'] = Recommendation(rec)
         else:
-            validated['recommendation'] = 'HOLD'
+            validated['recommendation'] = Recommendation.HOLD
 
         # Validate target_allocation
         allocation = data.get('target_allocation', 'STABLE').upper()
         if allocation in ['STABLE', 'RISKY']:
-            validated['target_allocation'] = allocation
+            validated['target_allocation'] = StockCategory(allocation)
         else:
-            validated['target_allocation'] = 'STABLE'
+            validated['target_allocation'] = StockCategory.STABLE
 
         # Optional numeric fields
         for field in ['price_target_7d', 'price_target_30d', 'support_level', 'resistance_level']:
@@ -219,6 +462,71 @@ Provide a conservative but actionable analysis.
 
         return validated
 
+    def _rule_based_analysis(
+        self, stock_data: StockData, max_confidence: float = 1.0
+    ) -> Tuple[AIAnalysis, float]:
+        """Score price and technical signals, returning the analysis and how strongly they agree.
+
+        Each available signal votes bullish or bearish; the rule confidence is
+        the net vote over all possible signals, so it is only high when most
+        signals are present and none disagree.
+        """
+        price = stock_data.price_data.close
+        change_percent = stock_data.price_data.change_percent or 0
+        tech = stock_data.technical_indicators or TechnicalIndicators()
+
+        signals = []  # (vote, description)
+        if change_percent > 2:
+            signals.append((1, f"{change_percent:.1f}% daily change"))
+        elif change_percent < -2:
+            signals.append((-1, f"{change_percent:.1f}% daily change"))
+        if tech.rsi_14 is not None:
+            if tech.rsi_14 < 30:
+                signals.append((1, f"Oversold RSI {tech.rsi_14:.0f}"))
+            elif tech.rsi_14 > 70:
+                signals.append((-1, f"Overbought RSI {tech.rsi_14:.0f}"))
+        if tech.macd is not None and tech.macd_signal is not None and tech.macd != tech.macd_signal:
+            if tech.macd > tech.macd_signal:
+                signals.append((1, "MACD above signal line"))
+            else:
+                signals.append((-1, "MACD below signal line"))
+        if tech.bollinger_lower and price < tech.bollinger_lower:
+            signals.append((1, "Price below lower Bollinger band"))
+        elif tech.bollinger_upper and price > tech.bollinger_upper:
+            signals.append((-1, "Price above upper Bollinger band"))
+        if tech.sma_50:
+            if price > tech.sma_50:
+                signals.append((1, "Price above SMA 50"))
+            elif price < tech.sma_50:
+                signals.append((-1, "Price below SMA 50"))
+
+        net = sum(vote for vote, _ in signals)
+        rule_confidence = abs(net) / 5
+
+        if net >= 2:
+            trend = TrendDirection.BULLISH
+            recommendation = Recommendation.BUY
+        elif net <= -2:
+            trend = TrendDirection.BEARISH
+            recommendation = Recommendation.SELL
+        else:
+            trend = TrendDirection.SIDEWAYS
+            recommendation = Recommendation.HOLD
+
+        analysis = AIAnalysis(
+            trend_direction=trend,
+            trend_strength=min(abs(change_percent) / 5, 1.0),
+            risk_score=0.6 if stock_data.category == StockCategory.RISKY else 0.3,
+            recommendation=recommendation,
+            confidence_level=min(rule_confidence, max_confidence),
+            target_allocation=stock_data.category,
+            support_level=tech.bollinger_lower or None,
+            resistance_level=tech.bollinger_upper or None,
+            key_factors=["Rule-based analysis"] + [desc for _, desc in signals][:4],
+            reasoning=f"Rule-based analysis from {len(signals)} price and technical signals (net score {net:+d})."
+        )
+        return analysis, rule_confidence
+
     def _fallback_analysis(self, stock_data: StockData) -> AIAnalysis:
         """Provide fallback analysis when LLM fails"""
         # Simple rule-based analysis
@@ -259,12 +567,12 @@ Provide a conservative but actionable analysis.
                     else:
                         risky_picks.append(stock)
 
-            # Sort by confidence level
-            stable_picks.sort(key=lambda x: x.ai_analysis.confidence_level, reverse=True)
-            risky_picks.sort(key=lambda x: x.ai_analysis.confidence_level, reverse=True)
+            # Keep the top 3 by confidence level
+            stable_picks = heapq.nlargest(3, stable_picks, key=lambda x: x.ai_analysis.confidence_level)
+            risky_picks = heapq.nlargest(3, risky_picks, key=lambda x: x.ai_analysis.confidence_level)
 
             # Create report prompt
-            prompt = self._create_report_prompt(analyzed_stocks, stable_picks[:3], risky_picks[:3])
+            prompt = self._create_report_prompt(analyzed_stocks, stable_picks, risky_picks)
 
             response = await self.llm_adapter.chat_completion(
                 prompt=prompt, 
@@ -287,7 +595,7 @@ Provide a conservative but actionable analysis.
                             stable_picks: List[StockData],
                             risky_picks: List[StockData]) -> str:
         """Create prompt for daily report generation"""
-        return f"""
+        return "".join((f"""
 Create a daily investment report based on analysis of {len(all_stocks)} stocks.
 
 TOP STABLE PICKS (for $200 investment):
@@ -296,35 +604,7 @@ TOP STABLE PICKS (for $200 investment):
 TOP RISKY PICKS (for $50 investment):
 {self._format_stock_picks(risky_picks)}
 
-Create a comprehensive daily report with the following structure:
-
-1. **Market Overview**
-   - Brief assessment of overall market conditions
-   - Key market drivers and themes
-
-2. **Stable Investment Recommendation ($200)**
-   - Primary recommendation with specific reasoning
-   - Entry strategy and key levels to watch
-   - Risk factors to monitor
-
-3. **Risky Investment Recommendation ($50)**
-   - High-potential pick with growth rationale
-   - Expected return potential and timeframe
-   - Maximum risk tolerance
-
-4. **Key Market Risks & Opportunities**
-   - 3-4 major factors affecting the market
-   - Sector rotation opportunities
-   - Economic indicators to watch
-
-5. **Technical & Fundamental Summary**
-   - Market breadth and momentum
-   - Valuation concerns or opportunities
-   - Sentiment indicators
-
-Keep the report actionable, concise, and focused on the specific $200/$50 allocation strategy.
-Include specific price levels and timeframes where relevant.
-"""
+""", _REPORT_PROMPT_SUFFIX))
 
     def _format_stock_picks(self, picks: List[StockData]) -> str:
         """Format stock picks for report prompt"""
@@ -346,46 +626,46 @@ Include specific price levels and timeframes where relevant.
         stable_pick = stable_picks[0] if stable_picks else None
         risky_pick = risky_picks[0] if risky_picks else None
 
-        report = f"""
+        parts = [f"""
 # Daily Investment Report - {datetime.now().strftime('%Y-%m-%d')}
 
 ## Market Overview
 Market analysis unavailable due to technical issues. Providing basic recommendations based on available data.
 
 ## Stable Investment Recommendation ($200)
-"""
+"""]
 
         if stable_pick:
-            report += f"""
+            parts.append(f"""
 **Recommended:** {stable_pick.symbol} at ${stable_pick.price_data.close:.2f}
 - Daily Change: {stable_pick.price_data.change_percent:.2f}%
 - Category: Stable investment
 - Basic analysis suggests {'positive' if stable_pick.price_data.change_percent > 0 else 'negative'} momentum
-"""
+""")
         else:
-            report += "No strong stable recommendations available today. Consider holding cash or index funds."
+            parts.append("No strong stable recommendations available today. Consider holding cash or index funds.")
 
-        report += "\n## Risky Investment Recommendation ($50)\n"
+        parts.append("\n## Risky Investment Recommendation ($50)\n")
 
         if risky_pick:
-            report += f"""
+            parts.append(f"""
 **Recommended:** {risky_pick.symbol} at ${risky_pick.price_data.close:.2f}
 - Daily Change: {risky_pick.price_data.change_percent:.2f}%
 - Category: High-risk/high-reward
 - Volatile stock with potential for significant moves
-"""
+""")
         else:
-            report += "No strong risky recommendations available today. Consider waiting for better opportunities."
+            parts.append("No strong risky recommendations available today. Consider waiting for better opportunities.")
 
-        report += """
+        parts.append("""
 
 ## Important Notice
 This is a simplified report due to technical limitations. Please conduct additional research before making investment decisions.
 
 *Generated by automated system*
-"""
+""")
 
-        return report
+        return "".join(parts)
 
     async def get_market_overview(self, analyzed_stocks: List[StockData]) -> MarketOverview:
         """Generate market overview from analyzed stocks"""
@@ -396,15 +676,16 @@ This is a simplified report due to technical limitations. Please conduct additio
             total_stocks = len(analyzed_stocks)
             market_sentiment = "POSITIVE" if total_gains > total_stocks * 0.6 else "NEGATIVE" if total_gains < total_stocks * 0.4 else "MIXED"
 
-            # Get key themes from stock analysis
-            themes = []
-            for stock in analyzed_stocks:
-                if stock.ai_analysis and stock.ai_analysis.key_factors:
-                    themes.extend(stock.ai_analysis.key_factors)
+            # Count key themes straight from the analyses, without an intermediate list;
+            # interned factors hash and compare by identity when repeated
+            themes = Counter(map(sys.intern, chain.from_iterable(
+                stock.ai_analysis.key_factors
+                for stock in analyzed_stocks
+                if stock.ai_analysis and stock.ai_analysis.key_factors
+            )))
 
             # Get most common themes
-            from collections import Counter
-            common_themes = [theme for theme, count in Counter(themes).most_common(3)]
+            common_themes = [theme for theme, count in themes.most_common(3)]
 
             return MarketOverview(
                 date=datetime.now(),
@@ -0,0 +1,112 @@
+import asyncio
+import hashlib
+import logging
+import time
+import weakref
+from functools import wraps
+from typing import Any, Callable, Dict
+
+import orjson
+import redis.asyncio as redis
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+from fastapi.responses import Response
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = f"redis://{settings.redis_host}:{settings.redis_port}/{settings.redis_db}"
+
+# One pool per event loop: asyncio connections can't be reused across loops,
+# and Celery tasks each run on their own short-lived loop
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, redis.ConnectionPool]" = weakref.WeakKeyDictionary()
+
+# After a connection failure, skip Redis for a while instead of paying the
+# connect timeout on every request while it is unreachable
+REDIS_COOLDOWN = 30  # seconds
+_redis_down_until = 0.0
+
+
+def redis_available() -> bool:
+    """Check whether Redis is usable, i.e. not in a post-failure cooldown"""
+    return time.monotonic() >= _redis_down_until
+
+
+def report_redis_error(error: Exception):
+    """Start the cooldown if an error means Redis is unreachable"""
+    global _redis_down_until
+    if isinstance(error, (RedisConnectionError, RedisTimeoutError)):
+        _redis_down_until = time.monotonic() + REDIS_COOLDOWN
+
+
+def get_redis() -> redis.Redis:
+    """Get a Redis client backed by the running loop's shared connection pool"""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = redis.ConnectionPool.from_url(
+            REDIS_URL,
+            max_connections=20,
+            socket_connect_timeout=1,
+            socket_timeout=1
+        )
+        _pools[loop] = pool
+    return redis.Redis(connection_pool=pool)
+
+
+async def close_cache():
+    """Close the running loop's pooled Redis connections"""
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.disconnect()
+
+
+def _cache_key(prefix: str, params: Dict[str, Any]) -> str:
+    """Build a stable cache key from the endpoint prefix and its parameters"""
+    raw = orjson.dumps(params, option=orjson.OPT_SORT_KEYS, default=str)
+    return f"http-cache:{prefix}:{hashlib.blake2b(raw, digest_size=16).hexdigest()}"
+
+
+def cached(prefix: str, ttl: int) -> Callable:
+    """Cache an endpoint's JSON response in Redis for ``ttl`` seconds.
+
+    Path and query parameters are hashed into the key. Redis errors are
+    logged and the handler is served uncached.
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not redis_available():
+                return await func(*args, **kwargs)
+
+            client = get_redis()
+            key = _cache_key(prefix, kwargs)
+
+            try:
+                raw = await client.get(key)
+            except Exception as e:
+                report_redis_error(e)
+                logger.warning(f"Response cache unavailable for {prefix}: {str(e)}")
+                return await func(*args, **kwargs)
+
+            if raw is not None:
+                return Response(raw, media_type="application/json")
+
+            result = await func(*args, **kwargs)
+
+            if isinstance(result, Response):
+                if result.status_code != 200:
+                    return result
+                body = result.body
+            else:
+                body = orjson.dumps(result)
+
+            try:
+                await client.setex(key, ttl, body)
+            except Exception as e:
+                report_redis_error(e)
+                logger.warning(f"Failed to cache response for {prefix}: {str(e)}")
+
+            return result
+        return wrapper
+    return decorator
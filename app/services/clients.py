@@ -0,0 +1,15 @@
+from .json_storage import JSONStorage
+from .data_collector import DataCollector
+from .llm_adapter import llm_adapter
+from .cache import close_cache
+
+# Single instances shared by the app and all API routers
+storage = JSONStorage()
+data_collector = DataCollector()
+
+
+async def close_clients():
+    """Release pooled HTTP and Redis connections"""
+    await llm_adapter.close()
+    await data_collector.close()
+    await close_cache()
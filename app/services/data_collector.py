@@ -1,10 +1,17 @@
 import requests
+import aiohttp
+import numpy as np
 import pandas as pd
 import asyncio
+import re
+import time
+import weakref
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, Tuple
 import logging
 
+from cachetools import TTLCache
+
 try:
     import yfinance as yf
 except ImportError:
@@ -27,6 +34,59 @@ from .json_storage import JSONStorage
 
 logger = logging.getLogger(__name__)
 
+# Headline keywords, matched in one pass; the named group tells the polarity.
+# Only the start of the word is anchored so inflections ("surged", "losses") count
+_POSITIVE_WORDS = ('up', 'rise', 'gain', 'bull', 'surge', 'jump', 'climb', 'rally', 'strong', 'beat')
+_NEGATIVE_WORDS = ('down', 'fall', 'drop', 'bear', 'crash', 'plunge', 'decline', 'weak', 'miss', 'loss')
+_SENTIMENT_RE = re.compile(
+    r"\b(?:(?P<pos>" + "|".join(_POSITIVE_WORDS) + r")|(?P<neg>" + "|".join(_NEGATIVE_WORDS) + r"))\w*"
+)
+
+# Quotes and indicators barely move within a few minutes, so reuse them that long
+STOCK_CACHE_TTL = 300
+
+
+def _last(series: pd.Series) -> Optional[float]:
+    """Latest value of an indicator series, or None while it is still warming up"""
+    value = series.iloc[-1]
+    return None if pd.isna(value) else float(value)
+
+
+def compute_indicators(hist: pd.DataFrame) -> TechnicalIndicators:
+    """Calculate RSI, MACD, SMAs and Bollinger Bands from daily price history.
+
+    Uses the same definitions as TA-Lib (Wilder smoothing for RSI,
+    population standard deviation for the bands), vectorized in pandas.
+    """
+    close = hist['Close']
+    
+    # RSI (14) with Wilder's smoothing
+    delta = close.diff()
+    avg_gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+    avg_loss = (-delta.clip(upper=0)).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+    rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+    
+    # MACD (12, 26, 9)
+    macd = (
+        close.ewm(span=12, adjust=False, min_periods=12).mean()
+        - close.ewm(span=26, adjust=False, min_periods=26).mean()
+    )
+    macd_signal = macd.ewm(span=9, adjust=False, min_periods=9).mean()
+    
+    # Moving averages and Bollinger Bands (20, 2)
+    sma_20 = close.rolling(window=20).mean()
+    std_20 = close.rolling(window=20).std(ddof=0)
+    
+    return TechnicalIndicators(
+        rsi_14=_last(rsi),
+        macd=_last(macd),
+        macd_signal=_last(macd_signal),
+        sma_20=_last(sma_20),
+        sma_50=_last(close.rolling(window=50).mean()),
+        bollinger_upper=_last(sma_20 + 2 * std_20),
+        bollinger_lower=_last(sma_20 - 2 * std_20)
+    )
+
 
 class DataCollector:
     def __init__(self):
@@ -46,6 +106,58 @@ class DataCollector:
         
         # Financial Modeling Prep base URL
         self.fmp_base_url = "https://financialmodelingprep.com/api/v3"
+        
+        # Short-lived per-symbol results; one lock per key so concurrent
+        # callers share a single fetch instead of stampeding the providers
+        self._stock_cache = TTLCache(maxsize=512, ttl=STOCK_CACHE_TTL)
+        self._indicator_cache = TTLCache(maxsize=512, ttl=STOCK_CACHE_TTL)
+        self._cache_locks: "weakref.WeakValueDictionary[Any, asyncio.Lock]" = weakref.WeakValueDictionary()
+        
+        # Last NewsAPI ETag and parsed result per symbol, for conditional requests
+        self._etag_cache: Dict[str, Tuple[str, SentimentData]] = {}
+        
+        # Shared keep-alive HTTP session for NewsAPI calls
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Frozen copies of the watchlists for category lookups, keyed by the
+        # list object they were built from (the collector replaces, never mutates)
+        self._watchlist_sets: Dict[str, Tuple[List[str], FrozenSet[str]]] = {}
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300)
+            )
+            self._session_loop = loop
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+    
+    async def _memoized(self, cache: TTLCache, key: Any, fetch: Callable[[], Awaitable]) -> Any:
+        """Return a cached result, or run ``fetch`` once per key and cache a non-None result"""
+        result = cache.get(key)
+        if result is not None:
+            return result
+        
+        lock = self._cache_locks.get(key)
+        if lock is None:
+            lock = self._cache_locks[key] = asyncio.Lock()
+        
+        async with lock:
+            result = cache.get(key)
+            if result is None:
+                result = await fetch()
+                if result is not None:
+                    cache[key] = result
+            return result
     
     async def collect_daily_data(self) -> Dict[str, StockData]:
         """Collect data for all stocks in the watchlist"""
@@ -84,23 +196,37 @@ class DataCollector:
     
     async def collect_stock_data(self, symbols: List[str]) -> Dict[str, StockData]:
         """Collect data for a specific list of stock symbols"""
-        data = {}
+        # Bound concurrency so provider rate limits still hold
+        semaphore = asyncio.Semaphore(settings.max_concurrent)
         
-        for symbol in symbols:
-            try:
+        async def collect(symbol: str) -> Optional[StockData]:
+            async with semaphore:
                 logger.info(f"Collecting data for {symbol}")
-                stock_data = await self._collect_single_stock(symbol)
-                if stock_data:
-                    data[symbol] = stock_data
-                else:
-                    logger.warning(f"No data collected for {symbol}")
-            except Exception as e:
-                logger.error(f"Error collecting data for {symbol}: {str(e)}")
-                continue
+                return await self._collect_single_stock(symbol)
+        
+        results = await asyncio.gather(
+            *(collect(symbol) for symbol in symbols), return_exceptions=True
+        )
+        
+        data = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error collecting data for {symbol}: {str(result)}")
+            elif result:
+                data[symbol] = result
+            else:
+                logger.warning(f"No data collected for {symbol}")
         
         return data
     
     async def _collect_single_stock(self, symbol: str, stock_lists: Optional[Dict] = None) -> Optional[StockData]:
+        """Collect all data for a single stock, reusing results from the last few minutes"""
+        key = ("stock", symbol, int(time.time() // STOCK_CACHE_TTL))
+        return await self._memoized(
+            self._stock_cache, key, lambda: self._fetch_single_stock(symbol, stock_lists)
+        )
+    
+    async def _fetch_single_stock(self, symbol: str, stock_lists: Optional[Dict] = None) -> Optional[StockData]:
         """Collect all data for a single stock"""
         try:
             # Get basic price data from Financial Modeling Prep
@@ -109,14 +235,12 @@ class DataCollector:
                 logger.warning(f"No price data for {symbol}")
                 return None
             
-            # Get technical indicators
-            technical_indicators = await self._get_technical_indicators(symbol)
-            
-            # Get fundamental data from Financial Modeling Prep
-            fundamental_data = await self._get_fmp_fundamental_data(symbol)
-            
-            # Get sentiment data
-            sentiment_data = await self._get_sentiment_data(symbol)
+            # Get technical indicators, FMP fundamentals and news sentiment concurrently
+            technical_indicators, fundamental_data, sentiment_data = await asyncio.gather(
+                self._get_technical_indicators(symbol),
+                self._get_fmp_fundamental_data(symbol),
+                self._get_sentiment_data(symbol)
+            )
             
             # Determine category
             category = self._determine_category(symbol, stock_lists)
@@ -146,7 +270,7 @@ class DataCollector:
             url = f"{self.fmp_base_url}/quote/{symbol}"
             params = {"apikey": self.fmp_api_key}
             
-            response = requests.get(url, params=params, timeout=10)
+            response = await asyncio.to_thread(requests.get, url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -189,7 +313,7 @@ class DataCollector:
             url = f"{self.fmp_base_url}/key-metrics/{symbol}"
             params = {"apikey": self.fmp_api_key, "limit": 1}
             
-            response = requests.get(url, params=params, timeout=10)
+            response = await asyncio.to_thread(requests.get, url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -241,17 +365,27 @@ class DataCollector:
             )
     
     async def _get_technical_indicators(self, symbol: str) -> Optional[TechnicalIndicators]:
-        """Get technical indicators from Alpha Vantage with fallback to yfinance"""
+        """Get technical indicators without blocking the event loop"""
+        return await self._memoized(
+            self._indicator_cache,
+            ("indicators", symbol),
+            lambda: self._fetch_technical_indicators(symbol)
+        )
+    
+    async def _fetch_technical_indicators(self, symbol: str) -> Optional[TechnicalIndicators]:
+        """Get technical indicators from yfinance with fallback to Alpha Vantage"""
         # Try yfinance first to avoid Alpha Vantage rate limits
+        indicators = await asyncio.to_thread(self._yfinance_indicators, symbol)
+        if indicators is not None:
+            return indicators
+        return await self._alpha_vantage_indicators(symbol)
+    
+    def _yfinance_indicators(self, symbol: str) -> Optional[TechnicalIndicators]:
+        """Calculate technical indicators from yfinance price history"""
         try:
             if not yf:
                 raise ImportError("yfinance not available")
             
-            try:
-                import talib
-            except ImportError:
-                talib = None
-            
             ticker = yf.Ticker(symbol)
             hist = ticker.history(period="1y")
             
@@ -259,91 +393,34 @@ class DataCollector:
                 logger.warning(f"No historical data available for {symbol}")
                 return None
             
-            # Calculate indicators using TA-Lib if available, otherwise basic calculations
-            try:
-                # RSI
-                rsi = talib.RSI(hist['Close'].values, timeperiod=14)[-1] if len(hist) >= 14 else None
-                
-                # MACD
-                macd_line, macd_signal, _ = talib.MACD(hist['Close'].values)
-                macd = macd_line[-1] if len(macd_line) > 0 else None
-                macd_sig = macd_signal[-1] if len(macd_signal) > 0 else None
-                
-                # SMA
-                sma_20 = talib.SMA(hist['Close'].values, timeperiod=20)[-1] if len(hist) >= 20 else None
-                sma_50 = talib.SMA(hist['Close'].values, timeperiod=50)[-1] if len(hist) >= 50 else None
-                
-                # Bollinger Bands
-                bb_upper, _, bb_lower = talib.BBANDS(hist['Close'].values, timeperiod=20)
-                bollinger_upper = bb_upper[-1] if len(bb_upper) > 0 else None
-                bollinger_lower = bb_lower[-1] if len(bb_lower) > 0 else None
-                
-            except (ImportError, AttributeError):
-                logger.warning("TA-Lib not available, using basic calculations")
-                # Basic calculations without TA-Lib
-                close_prices = hist['Close']
-                
-                # Simple RSI calculation
-                delta = close_prices.diff()
-                gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-                loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-                rs = gain / loss
-                rsi = 100 - (100 / (1 + rs)).iloc[-1] if len(close_prices) >= 14 else None
-                
-                # Simple moving averages
-                sma_20 = close_prices.rolling(window=20).mean().iloc[-1] if len(close_prices) >= 20 else None
-                sma_50 = close_prices.rolling(window=50).mean().iloc[-1] if len(close_prices) >= 50 else None
-                
-                # Simple Bollinger Bands
-                if len(close_prices) >= 20:
-                    sma_20_full = close_prices.rolling(window=20).mean()
-                    std_20 = close_prices.rolling(window=20).std()
-                    bollinger_upper = (sma_20_full + (std_20 * 2)).iloc[-1]
-                    bollinger_lower = (sma_20_full - (std_20 * 2)).iloc[-1]
-                else:
-                    bollinger_upper = None
-                    bollinger_lower = None
-                
-                macd = None
-                macd_sig = None
-            
-            return TechnicalIndicators(
-                rsi_14=float(rsi) if rsi is not None and not pd.isna(rsi) else None,
-                macd=float(macd) if macd is not None and not pd.isna(macd) else None,
-                macd_signal=float(macd_sig) if macd_sig is not None and not pd.isna(macd_sig) else None,
-                sma_20=float(sma_20) if sma_20 is not None and not pd.isna(sma_20) else None,
-                sma_50=float(sma_50) if sma_50 is not None and not pd.isna(sma_50) else None,
-                bollinger_upper=float(bollinger_upper) if bollinger_upper is not None and not pd.isna(bollinger_upper) else None,
-                bollinger_lower=float(bollinger_lower) if bollinger_lower is not None and not pd.isna(bollinger_lower) else None
-            )
+            return compute_indicators(hist)
             
         except Exception as e:
             logger.warning(f"Error getting technical indicators from yfinance for {symbol}: {str(e)}")
-        
-        # Fallback to Alpha Vantage if yfinance fails and API key is available
+            return None
+    
+    async def _alpha_vantage_indicators(self, symbol: str) -> Optional[TechnicalIndicators]:
+        """Get technical indicators from Alpha Vantage"""
         if not self.av_key:
             logger.warning("Alpha Vantage API key not provided, skipping technical indicators")
             return None
         
         try:
-            # Get RSI with proper float conversion
-            rsi_data, _ = self.ti.get_rsi(symbol=symbol, interval='daily', time_period=14, series_type='close')
-            rsi = float(rsi_data.iloc[-1]) if not rsi_data.empty else None
+            # The SDK is blocking and each indicator is a separate request, so fetch them concurrently
+            (rsi_data, _), (macd_data, _), (sma20_data, _), (sma50_data, _), (bb_data, _) = await asyncio.gather(
+                asyncio.to_thread(self.ti.get_rsi, symbol=symbol, interval='daily', time_period=14, series_type='close'),
+                asyncio.to_thread(self.ti.get_macd, symbol=symbol, interval='daily', series_type='close'),
+                asyncio.to_thread(self.ti.get_sma, symbol=symbol, interval='daily', time_period=20, series_type='close'),
+                asyncio.to_thread(self.ti.get_sma, symbol=symbol, interval='daily', time_period=50, series_type='close'),
+                asyncio.to_thread(self.ti.get_bbands, symbol=symbol, interval='daily', time_period=20, series_type='close')
+            )
             
-            # Get MACD with proper float conversion
-            macd_data, _ = self.ti.get_macd(symbol=symbol, interval='daily', series_type='close')
+            # Convert the latest values to floats
+            rsi = float(rsi_data.iloc[-1]) if not rsi_data.empty else None
             macd = float(macd_data['MACD'].iloc[-1]) if not macd_data.empty else None
             macd_signal = float(macd_data['MACD_Signal'].iloc[-1]) if not macd_data.empty else None
-            
-            # Get SMA indicators with proper float conversion
-            sma20_data, _ = self.ti.get_sma(symbol=symbol, interval='daily', time_period=20, series_type='close')
             sma_20 = float(sma20_data.iloc[-1]) if not sma20_data.empty else None
-            
-            sma50_data, _ = self.ti.get_sma(symbol=symbol, interval='daily', time_period=50, series_type='close')
             sma_50 = float(sma50_data.iloc[-1]) if not sma50_data.empty else None
-            
-            # Get Bollinger Bands with proper float conversion
-            bb_data, _ = self.ti.get_bbands(symbol=symbol, interval='daily', time_period=20, series_type='close')
             bollinger_upper = float(bb_data['Real Upper Band'].iloc[-1]) if not bb_data.empty else None
             bollinger_lower = float(bb_data['Real Lower Band'].iloc[-1]) if not bb_data.empty else None
             
@@ -389,24 +466,36 @@ class DataCollector:
                 'apiKey': self.news_api_key
             }
             
-            response = requests.get(url, params=params)
-            if response.status_code == 200:
-                news_data = response.json()
-                articles_count = len(news_data.get('articles', []))
-                
-                # Simple sentiment scoring based on headline keywords
-                sentiment_score = self._calculate_sentiment_score(news_data.get('articles', []))
-                
-                return SentimentData(
-                    news_sentiment_score=sentiment_score,
-                    news_articles_count=articles_count,
-                    social_sentiment=0.5,  # Placeholder
-                    analyst_rating="NEUTRAL"  # Placeholder
-                )
-            else:
-                logger.warning(f"News API request failed: {response.status_code}")
-                return None
-                
+            # Revalidate instead of re-downloading when the news hasn't changed
+            cached = self._etag_cache.get(symbol)
+            headers = {'If-None-Match': cached[0]} if cached else None
+            
+            async with self._get_session().get(
+                url, params=params, headers=headers, timeout=aiohttp.ClientTimeout(total=5)
+            ) as response:
+                if response.status == 304 and cached:
+                    return cached[1]
+                if response.status != 200:
+                    logger.warning(f"News API request failed: {response.status}")
+                    return None
+                news_data = await response.json()
+                etag = response.headers.get('ETag')
+            
+            articles_count = len(news_data.get('articles', []))
+            
+            # Simple sentiment scoring based on headline keywords
+            sentiment_score = self._calculate_sentiment_score(news_data.get('articles', []))
+            
+            sentiment_data = SentimentData(
+                news_sentiment_score=sentiment_score,
+                news_articles_count=articles_count,
+                social_sentiment=0.5,  # Placeholder
+                analyst_rating="NEUTRAL"  # Placeholder
+            )
+            if etag:
+                self._etag_cache[symbol] = (etag, sentiment_data)
+            return sentiment_data
+            
         except Exception as e:
             logger.error(f"Error getting sentiment data for {symbol}: {str(e)}")
             return None
@@ -416,40 +505,43 @@ class DataCollector:
         if not articles:
             return 0.5
         
-        positive_words = ['up', 'rise', 'gain', 'bull', 'surge', 'jump', 'climb', 'rally', 'strong', 'beat']
-        negative_words = ['down', 'fall', 'drop', 'bear', 'crash', 'plunge', 'decline', 'weak', 'miss', 'loss']
-        
-        total_score = 0
-        for article in articles:
-            title = article.get('title', '').lower()
-            description = article.get('description', '').lower()
-            text = f"{title} {description}"
-            
-            positive_count = sum(1 for word in positive_words if word in text)
-            negative_count = sum(1 for word in negative_words if word in text)
-            
-            if positive_count + negative_count > 0:
-                score = positive_count / (positive_count + negative_count)
-            else:
-                score = 0.5
-            
-            total_score += score
+        positive_counts = np.zeros(len(articles), dtype=np.int32)
+        total_counts = np.zeros(len(articles), dtype=np.int32)
+        for i, article in enumerate(articles):
+            text = f"{article.get('title') or ''}\n{article.get('description') or ''}".lower()
+            # Count each keyword once per article, however often it appears
+            hits = {(match.lastgroup, match.group(match.lastgroup)) for match in _SENTIMENT_RE.finditer(text)}
+            positive_counts[i] = sum(1 for polarity, _ in hits if polarity == 'pos')
+            total_counts[i] = len(hits)
         
-        return total_score / len(articles) if articles else 0.5
+        # Articles without any keyword score neutral (0.5)
+        scores = np.divide(
+            positive_counts, total_counts,
+            out=np.full(len(articles), 0.5), where=total_counts > 0
+        )
+        return float(scores.mean())
+    
+    def _watchlist_set(self, name: str, symbols: List[str]) -> FrozenSet[str]:
+        """Get a frozenset of a watchlist, rebuilt only when the list is replaced"""
+        entry = self._watchlist_sets.get(name)
+        if entry is None or entry[0] is not symbols:
+            entry = (symbols, frozenset(symbols))
+            self._watchlist_sets[name] = entry
+        return entry[1]
     
     def _determine_category(self, symbol: str, stock_lists: Optional[Dict] = None) -> StockCategory:
         """Determine if stock is stable or risky based on dynamic lists"""
         if stock_lists:
-            if symbol in stock_lists.get("stable", []):
+            if symbol in self._watchlist_set("stable", stock_lists.get("stable", [])):
                 return StockCategory.STABLE
-            elif symbol in stock_lists.get("risky", []):
+            elif symbol in self._watchlist_set("risky", stock_lists.get("risky", [])):
                 return StockCategory.RISKY
         
         # Fallback: try to get current lists from collector
         current_lists = self.stock_collector.get_current_lists()
-        if symbol in current_lists.get("stable", []):
+        if symbol in self._watchlist_set("stable", current_lists.get("stable", [])):
             return StockCategory.STABLE
-        elif symbol in current_lists.get("risky", []):
+        elif symbol in self._watchlist_set("risky", current_lists.get("risky", [])):
             return StockCategory.RISKY
         
         # Default to stable for unknown stocks
@@ -1,15 +1,83 @@
 import json
 import os
+import asyncio
 import logging
+import sqlite3
+from contextlib import contextmanager
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set, Tuple
 from pathlib import Path
 
+import orjson
+
+from .cache import get_redis, redis_available, report_redis_error
 from ..models.stock_data import StockData
 from ..models.reports import DailyReport, SummaryReport
 
 logger = logging.getLogger(__name__)
 
+# Redis hash mirroring the newest stock data per symbol (field = symbol), and a
+# companion hash holding the ISO date of each mirrored record
+LATEST_STOCK_KEY = "latest_stock"
+LATEST_STOCK_DATE_KEY = "latest_stock_date"
+
+# Both hashes expire a day after the last write, bounding how long a record
+# can outlive a save whose Redis update was lost
+LATEST_STOCK_TTL = 86400
+
+# Replace a symbol's latest record only if it is not older than the stored one,
+# so backfills and re-saves of past dates can't clobber the newest data. Any
+# symbols in ARGV[5..] had a save that never reached Redis and are dropped.
+_SET_LATEST_SCRIPT = """
+for i = 5, #ARGV do
+    redis.call('HDEL', KEYS[1], ARGV[i])
+    redis.call('HDEL', KEYS[2], ARGV[i])
+end
+local current = redis.call('HGET', KEYS[2], ARGV[1])
+if current and current > ARGV[2] then
+    return 0
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[3])
+redis.call('HSET', KEYS[2], ARGV[1], ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+return 1
+"""
+
+# Drop latest records dated before the cutoff (their files are being deleted)
+_PRUNE_LATEST_SCRIPT = """
+local dates = redis.call('HGETALL', KEYS[2])
+local removed = 0
+for i = 1, #dates, 2 do
+    if dates[i + 1] < ARGV[1] then
+        redis.call('HDEL', KEYS[1], dates[i])
+        redis.call('HDEL', KEYS[2], dates[i])
+        removed = removed + 1
+    end
+end
+return removed
+"""
+
+# Files are written compact: indentation roughly doubles the size of the nested
+# price/indicator/analysis records without helping any reader but a human
+_DUMP_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _loads(raw: bytes) -> Any:
+    """Parse JSON with orjson, falling back to json for legacy files containing NaN/Infinity"""
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return json.loads(raw)
+
+
+@lru_cache(maxsize=8)
+def _read_json_versioned(path: str, mtime_ns: int) -> Dict:
+    """Parse a JSON file once per (path, mtime); re-reads only after it is rewritten"""
+    with open(path, 'rb') as f:
+        return _loads(f.read())
+
 
 class JSONStorage:
     def __init__(self, data_dir: str = "data"):
@@ -20,6 +88,13 @@ class JSONStorage:
         (self.data_dir / "stocks").mkdir(exist_ok=True)
         (self.data_dir / "reports").mkdir(exist_ok=True)
         (self.data_dir / "summaries").mkdir(exist_ok=True)
+        
+        # Sidecar index of summary reports so "latest" is a single lookup
+        self.summary_index_path = self.data_dir / "summaries" / "_index.db"
+        
+        # Symbols saved to disk whose latest-stock cache update failed or was
+        # skipped; their stale cache entries are dropped on the next write
+        self._unsynced_latest: Set[str] = set()
     
     async def save_stock_data(self, stock_data: StockData) -> bool:
         """Save stock data to JSON file"""
@@ -32,8 +107,9 @@ class JSONStorage:
             data = stock_data.model_dump()
             data['date'] = stock_data.date.isoformat()
             
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            self._write_json_file(filepath, data)
+            
+            await self._cache_latest(stock_data.symbol, data)
             
             logger.debug(f"Saved stock data: {filename}")
             return True
@@ -42,39 +118,110 @@ class JSONStorage:
             logger.error(f"Error saving stock data for {stock_data.symbol}: {str(e)}")
             return False
     
+    async def _cache_latest(self, symbol: str, data: Dict):
+        """Mirror saved stock data into the latest-per-symbol Redis hash unless a newer record is there"""
+        if not redis_available():
+            self._unsynced_latest.add(symbol)
+            return
+        unsynced = self._unsynced_latest - {symbol}
+        try:
+            await get_redis().eval(
+                _SET_LATEST_SCRIPT, 2, LATEST_STOCK_KEY, LATEST_STOCK_DATE_KEY,
+                symbol, data['date'], orjson.dumps(data, default=str, option=_DUMP_OPTIONS),
+                LATEST_STOCK_TTL, *unsynced
+            )
+            self._unsynced_latest -= unsynced | {symbol}
+        except Exception as e:
+            report_redis_error(e)
+            self._unsynced_latest.add(symbol)
+            logger.warning(f"Could not cache latest stock data for {symbol}: {str(e)}")
+    
+    async def _get_cached_latest(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Fetch latest stock data for the given symbols from Redis in one HMGET"""
+        if not redis_available():
+            return {}
+        try:
+            blobs = await get_redis().hmget(LATEST_STOCK_KEY, symbols)
+        except Exception as e:
+            report_redis_error(e)
+            logger.warning(f"Latest stock cache unavailable: {str(e)}")
+            return {}
+        
+        return {symbol: orjson.loads(blob) for symbol, blob in zip(symbols, blobs) if blob}
+    
     async def get_latest_stock_data(self, symbol: str) -> Optional[Dict]:
         """Get latest stock data for a symbol"""
         try:
-            # Look for files with this symbol, get the most recent
-            stock_files = list(self.data_dir.glob(f"stocks/*_{symbol}.json"))
-            if not stock_files:
-                return None
+            cached = await self._get_cached_latest([symbol])
+            if symbol in cached:
+                return cached[symbol]
             
-            # Sort by date (filename contains date)
-            latest_file = sorted(stock_files)[-1]
-            
-            with open(latest_file, 'r') as f:
-                data = json.load(f)
-            
-            return data
+            # Directory scan and read are blocking, so keep them off the event loop
+            return await asyncio.to_thread(self._read_latest_file, symbol)
             
         except Exception as e:
             logger.error(f"Error getting latest stock data for {symbol}: {str(e)}")
             return None
     
+    async def get_latest_batch(self, symbols: List[str]) -> List[Dict]:
+        """Get latest stock data for several symbols, falling back to one directory scan"""
+        try:
+            cached = await self._get_cached_latest(symbols)
+            wanted = {symbol for symbol in symbols if symbol not in cached}
+            if not wanted:
+                return [cached[symbol] for symbol in symbols if symbol in cached]
+            
+            # One directory scan in a worker thread; it grows with 90 days of files
+            latest = await asyncio.to_thread(self._scan_latest_names, wanted)
+            
+            # Read the matched files concurrently in worker threads
+            misses = [symbol for symbol in symbols if symbol in latest]
+            results = await asyncio.gather(
+                *(asyncio.to_thread(self._read_json_file, self.data_dir / "stocks" / latest[symbol])
+                  for symbol in misses),
+                return_exceptions=True
+            )
+            for symbol, result in zip(misses, results):
+                if result and not isinstance(result, Exception):
+                    cached[symbol] = result
+            
+            return [cached[symbol] for symbol in symbols if symbol in cached]
+            
+        except Exception as e:
+            logger.error(f"Error getting latest stock data batch: {str(e)}")
+            return []
+    
+    def _read_latest_file(self, symbol: str) -> Optional[Dict]:
+        """Read the most recent stock data file for a symbol from disk"""
+        # Look for files with this symbol, get the most recent
+        stock_files = list(self.data_dir.glob(f"stocks/*_{symbol}.json"))
+        if not stock_files:
+            return None
+        
+        # Sort by date (filename contains date)
+        latest_file = sorted(stock_files)[-1]
+        
+        with open(latest_file, 'rb') as f:
+            return _loads(f.read())
+    
+    def _scan_latest_names(self, wanted: Set[str]) -> Dict[str, str]:
+        """Find the newest stock data filename for each wanted symbol"""
+        latest: Dict[str, str] = {}
+        
+        # Filenames are YYYY-MM-DD_SYMBOL.json, so the max name per symbol is the latest
+        with os.scandir(self.data_dir / "stocks") as entries:
+            for entry in entries:
+                name = entry.name
+                symbol = name[11:-5]
+                if symbol in wanted and name.endswith(".json") and name > latest.get(symbol, ""):
+                    latest[symbol] = name
+        return latest
+    
     async def get_stocks_by_date(self, date: str) -> List[Dict]:
         """Get all stock data for a specific date"""
         try:
-            pattern = f"stocks/{date}_*.json"
-            stock_files = list(self.data_dir.glob(pattern))
-            
-            stocks = []
-            for file in stock_files:
-                with open(file, 'r') as f:
-                    data = json.load(f)
-                    stocks.append(data)
-            
-            return stocks
+            # Glob and parse in a worker thread so a full day of files doesn't block the event loop
+            return await asyncio.to_thread(self._read_stocks_by_date, date)
             
         except Exception as e:
             logger.error(f"Error getting stocks for date {date}: {str(e)}")
@@ -91,8 +238,7 @@ class JSONStorage:
             data['date'] = report.date.isoformat()
             data['market_overview']['date'] = report.market_overview.date.isoformat()
             
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            self._write_json_file(filepath, data)
             
             logger.info(f"Saved daily report: {filename}")
             return True
@@ -107,18 +253,57 @@ class JSONStorage:
             filename = f"DR_{date}.json"
             filepath = self.data_dir / "reports" / filename
             
-            if not filepath.exists():
-                return None
-            
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-            
-            return data
+            # Read in a worker thread so concurrent lookups overlap disk I/O
+            return await asyncio.to_thread(self._read_daily_report_file, filepath)
             
         except Exception as e:
             logger.error(f"Error getting daily report for {date}: {str(e)}")
             return None
     
+    def get_daily_report_mtime(self, date: str) -> Optional[int]:
+        """Get the modification time (ns) of a daily report file, or None if absent"""
+        try:
+            return os.stat(self.data_dir / "reports" / f"DR_{date}.json").st_mtime_ns
+        except FileNotFoundError:
+            return None
+    
+    @staticmethod
+    def _read_daily_report_file(filepath: Path) -> Optional[Dict]:
+        """Read a daily report, reusing the parsed copy while the file is unchanged"""
+        try:
+            mtime_ns = os.stat(filepath).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        return _read_json_versioned(str(filepath), mtime_ns)
+    
+    @staticmethod
+    def _read_json_file(filepath: Path) -> Optional[Dict]:
+        """Read a JSON file, returning None if it does not exist"""
+        try:
+            with open(filepath, 'rb') as f:
+                return _loads(f.read())
+        except FileNotFoundError:
+            return None
+    
+    def _read_stocks_by_date(self, date: str) -> List[Dict]:
+        """Find and read all stock data files for a date"""
+        return self._read_json_files(list(self.data_dir.glob(f"stocks/{date}_*.json")))
+    
+    @staticmethod
+    def _read_json_files(filepaths: List[Path]) -> List[Dict]:
+        """Read several JSON files in order"""
+        results = []
+        for filepath in filepaths:
+            with open(filepath, 'rb') as f:
+                results.append(_loads(f.read()))
+        return results
+    
+    @staticmethod
+    def _write_json_file(filepath: Path, data: Dict):
+        """Write a dict as compact JSON, stringifying anything orjson can't encode"""
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, default=str, option=_DUMP_OPTIONS))
+    
     async def save_summary_report(self, report: SummaryReport) -> bool:
         """Save summary report to JSON file"""
         try:
@@ -130,8 +315,9 @@ class JSONStorage:
             data['start_date'] = report.start_date.isoformat()
             data['end_date'] = report.end_date.isoformat()
             
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            self._write_json_file(filepath, data)
+            
+            self._index_summary(filepath, data['end_date'])
             
             logger.info(f"Saved summary report: {filename}")
             return True
@@ -140,22 +326,119 @@ class JSONStorage:
             logger.error(f"Error saving summary report: {str(e)}")
             return False
     
+    @contextmanager
+    def _summary_index(self):
+        """Open the summary index in a transaction, creating the table if needed"""
+        conn = sqlite3.connect(self.summary_index_path, timeout=10)
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "report_id TEXT PRIMARY KEY, kind TEXT, path TEXT, mtime REAL, end_date TEXT)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS summaries_mtime ON summaries (kind, mtime)")
+            conn.execute("CREATE INDEX IF NOT EXISTS summaries_end_date ON summaries (end_date)")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def _index_summary(self, filepath: Path, end_date: Optional[str] = None):
+        """Record a summary report file in the sidecar index"""
+        try:
+            with self._summary_index() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?)",
+                    (filepath.stem, filepath.stem[:2], str(filepath),
+                     filepath.stat().st_mtime, end_date)
+                )
+        except Exception as e:
+            logger.error(f"Error indexing summary report {filepath.name}: {str(e)}")
+    
+    @staticmethod
+    def _read_summary_end_date(path: str) -> Optional[str]:
+        """Read the end of the period a summary report covers, or None if unreadable"""
+        try:
+            with open(path, 'rb') as f:
+                end_date = _loads(f.read()).get('end_date')
+            return str(end_date) if end_date else None
+        except Exception as e:
+            logger.warning(f"Could not read end_date from {path}: {str(e)}")
+            return None
+    
+    def rebuild_summary_index(self) -> int:
+        """Rebuild the summary index from the files in the summaries directory"""
+        try:
+            # Walk DirEntry objects directly rather than building Path objects via glob
+            with os.scandir(self.data_dir / "summaries") as entries:
+                rows = [
+                    (entry.name[:-5], entry.name[:2], entry.path, entry.stat().st_mtime,
+                     self._read_summary_end_date(entry.path))
+                    for entry in entries
+                    if entry.name.startswith(("SR_", "MR_")) and entry.name.endswith(".json")
+                ]
+            
+            with self._summary_index() as conn:
+                conn.execute("DELETE FROM summaries")
+                conn.executemany("INSERT INTO summaries VALUES (?, ?, ?, ?, ?)", rows)
+            
+            logger.info(f"Indexed {len(rows)} summary reports")
+            return len(rows)
+            
+        except Exception as e:
+            logger.error(f"Error rebuilding summary index: {str(e)}")
+            return 0
+    
+    def get_latest_summary_path(self, kinds: Tuple[str, ...] = ("SR", "MR")) -> Optional[Path]:
+        """Get the most recently written summary report of the given kinds (SR/MR)"""
+        try:
+            placeholders = ", ".join("?" for _ in kinds)
+            with self._summary_index() as conn:
+                row = conn.execute(
+                    f"SELECT path FROM summaries WHERE kind IN ({placeholders}) "
+                    "ORDER BY mtime DESC LIMIT 1",
+                    kinds
+                ).fetchone()
+            
+            return Path(row[0]) if row else None
+            
+        except Exception as e:
+            logger.error(f"Error querying summary index: {str(e)}")
+            return None
+    
+    def get_summary_paths_since(self, since: str) -> List[Path]:
+        """Get summary report files whose period ends at or after an ISO date, oldest first.
+
+        Filters on the report's own end_date rather than file mtime, so
+        restored or copied old reports don't count as recent.
+        """
+        try:
+            with self._summary_index() as conn:
+                rows = conn.execute(
+                    "SELECT path FROM summaries WHERE end_date >= ? ORDER BY end_date",
+                    (since,)
+                ).fetchall()
+            
+            return [Path(row[0]) for row in rows]
+            
+        except Exception as e:
+            logger.error(f"Error querying summary index: {str(e)}")
+            return []
+    
     async def get_daily_reports_range(self, start_date: str, end_date: str) -> List[Dict]:
         """Get daily reports within date range"""
         try:
             start = datetime.strptime(start_date, "%Y-%m-%d")
             end = datetime.strptime(end_date, "%Y-%m-%d")
             
-            reports = []
-            current = start
-            while current <= end:
-                date_str = current.strftime("%Y-%m-%d")
-                report = await self.get_daily_report(date_str)
-                if report:
-                    reports.append(report)
-                current += timedelta(days=1)
+            dates = [
+                (start + timedelta(days=i)).strftime("%Y-%m-%d")
+                for i in range((end - start).days + 1)
+            ]
+            
+            # Fetch all dates concurrently instead of one read at a time
+            results = await asyncio.gather(*(self.get_daily_report(d) for d in dates))
             
-            return reports
+            return [report for report in results if report]
             
         except Exception as e:
             logger.error(f"Error getting daily reports range: {str(e)}")
@@ -181,24 +464,26 @@ class JSONStorage:
     async def get_stock_history(self, symbol: str, days: int = 30) -> List[Dict]:
         """Get historical data for a stock"""
         try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
-            
-            history = []
-            current = start_date
-            while current <= end_date:
-                date_str = current.strftime("%Y-%m-%d")
-                filename = f"{date_str}_{symbol}.json"
-                filepath = self.data_dir / "stocks" / filename
-                
-                if filepath.exists():
-                    with open(filepath, 'r') as f:
-                        data = json.load(f)
-                        history.append(data)
-                
-                current += timedelta(days=1)
-            
-            return sorted(history, key=lambda x: x['date'], reverse=True)
+            # Bounds are compared as YYYY-MM-DD strings against filename prefixes
+            today = datetime.now().date()
+            start_str = (today - timedelta(days=days)).isoformat()
+            end_str = today.isoformat()
+            
+            # One directory scan filtered on the filename date covers the whole
+            # range (across month boundaries) without a stat per calendar day
+            with os.scandir(self.data_dir / "stocks") as entries:
+                names = [
+                    entry.name for entry in entries
+                    if entry.name.endswith(".json")
+                    and entry.name[11:-5] == symbol
+                    and start_str <= entry.name[:10] <= end_str
+                ]
+            
+            # Filenames start with the date, so name order is date order (newest first)
+            return await asyncio.to_thread(
+                self._read_json_files,
+                [self.data_dir / "stocks" / name for name in sorted(names, reverse=True)]
+            )
             
         except Exception as e:
             logger.error(f"Error getting stock history for {symbol}: {str(e)}")
@@ -206,6 +491,22 @@ class JSONStorage:
     
     async def cleanup_old_data(self, days_to_keep: int = 90):
         """Clean up old data files"""
+        # Globbing and unlinking hundreds of files is blocking work
+        await asyncio.to_thread(self._cleanup_old_files, days_to_keep)
+        
+        # Keep the latest-per-symbol cache from serving records whose files are gone
+        if not redis_available():
+            return
+        cutoff_str = (datetime.now() - timedelta(days=days_to_keep)).strftime("%Y-%m-%d")
+        try:
+            removed = await get_redis().eval(_PRUNE_LATEST_SCRIPT, 2, LATEST_STOCK_KEY, LATEST_STOCK_DATE_KEY, cutoff_str)
+            logger.info(f"Pruned {removed} stale entries from the latest stock cache")
+        except Exception as e:
+            report_redis_error(e)
+            logger.warning(f"Could not prune latest stock cache: {str(e)}")
+    
+    def _cleanup_old_files(self, days_to_keep: int):
+        """Remove stock data and daily reports older than the retention window"""
         try:
             cutoff_date = datetime.now() - timedelta(days=days_to_keep)
             cutoff_str = cutoff_date.strftime("%Y-%m-%d")
@@ -251,6 +552,11 @@ class JSONStorage:
     
     async def get_storage_stats(self) -> Dict[str, Any]:
         """Get storage statistics"""
+        # Globs and stats every stored file, so keep it off the event loop
+        return await asyncio.to_thread(self._collect_storage_stats)
+    
+    def _collect_storage_stats(self) -> Dict[str, Any]:
+        """Walk the data directories and summarize file counts, sizes and dates"""
         try:
             stock_files = list(self.data_dir.glob("stocks/*.json"))
             report_files = list(self.data_dir.glob("reports/*.json"))
@@ -285,7 +591,7 @@ class JSONStorage:
                 "total_size_mb": round(total_size / (1024 * 1024), 2),
                 "earliest_date": earliest_date,
                 "latest_date": latest_date,
-                "unique_symbols": len(await self.get_all_stock_symbols())
+                "unique_symbols": len({file.stem.split('_', 1)[1] for file in stock_files})
             }
             
         except Exception as e:
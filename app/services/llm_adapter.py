@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, Optional, Any
+from typing import Any, Dict, List, Optional
 import asyncio
 import aiohttp
 import json
@@ -31,6 +31,10 @@ class LLMAdapter:
         self.fallback_model = "gpt-5-mini"
         self.llm7_base_url = "https://api.llm7.io/v1"
 
+        # Shared keep-alive HTTP session for direct LLM7.io calls
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+
         self._init_llm7()
         self._init_openai()
 
@@ -72,22 +76,46 @@ class LLMAdapter:
             logger.error(f"Failed to initialize OpenAI client: {str(e)}")
             self.openai_client = None
 
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=60)
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
     async def chat_completion(
         self,
         prompt: str,
         temperature: float = 0.3,
         max_tokens: int = 1000,
-        timeout: int = 30
+        timeout: int = 30,
+        system: Optional[str] = None,
+        response_format: Optional[Dict[str, Any]] = None
     ) -> Optional[str]:
         """
-        Generate chat completion using primary provider with fallback
+        Generate chat completion using primary provider with fallback.
+
+        Static instructions go in ``system`` so they lead every request
+        unchanged and can be served from the provider's prefix cache.
+        ``response_format`` is passed through as the OpenAI-compatible
+        structured output setting, e.g. a ``json_schema`` the reply must match.
         """
         # Try llm7.io first
         if self.llm7_client:
             try:
                 logger.debug(f"Attempting LLM7.io completion with model {self.primary_model}")
                 response = await asyncio.wait_for(
-                    self._call_llm7(prompt, temperature, max_tokens),
+                    self._call_llm7(prompt, temperature, max_tokens, system, response_format),
                     timeout=timeout
                 )
                 if response:
@@ -103,7 +131,7 @@ class LLMAdapter:
             try:
                 logger.debug(f"Attempting OpenAI completion with model {self.fallback_model}")
                 response = await asyncio.wait_for(
-                    self._call_openai(prompt, temperature, max_tokens),
+                    self._call_openai(prompt, temperature, max_tokens, system, response_format),
                     timeout=timeout
                 )
                 if response:
@@ -117,19 +145,35 @@ class LLMAdapter:
         logger.error("All LLM providers failed")
         return None
 
-    async def _call_llm7(self, prompt: str, temperature: float, max_tokens: int) -> Optional[str]:
+    @staticmethod
+    def _build_messages(prompt: str, system: Optional[str] = None) -> List[Dict[str, str]]:
+        """Build chat messages, leading with the static system prompt if given"""
+        messages = [{"role": "system", "content": system}] if system else []
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    async def _call_llm7(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        system: Optional[str] = None,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
         """Call LLM7.io API"""
         try:
             if self.llm7_client == "direct_http":
                 # Use direct HTTP calls
-                return await self._call_llm7_direct(prompt, temperature, max_tokens)
+                return await self._call_llm7_direct(prompt, temperature, max_tokens, system, response_format)
             elif hasattr(self.llm7_client, 'invoke'):
                 # Use langchain wrapper
+                extra = {"response_format": response_format} if response_format else {}
                 response = await asyncio.to_thread(
                     self.llm7_client.invoke,
-                    prompt,
+                    [("system", system), ("human", prompt)] if system else prompt,
                     temperature=temperature,
-                    max_tokens=max_tokens
+                    max_tokens=max_tokens,
+                    **extra
                 )
 
                 if hasattr(response, 'content'):
@@ -147,7 +191,14 @@ class LLMAdapter:
             logger.error(f"LLM7.io API call failed: {str(e)}")
             raise
 
-    async def _call_llm7_direct(self, prompt: str, temperature: float, max_tokens: int) -> Optional[str]:
+    async def _call_llm7_direct(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        system: Optional[str] = None,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
         """Call LLM7.io API directly via HTTP"""
         headers = {
             "Authorization": f"Bearer {settings.llm7_api_key if settings.llm7_api_key else 'unused'}",
@@ -156,39 +207,50 @@ class LLMAdapter:
 
         payload = {
             "model": self.primary_model,
-            "messages": [{"role": "user", "content": prompt}],
+            "messages": self._build_messages(prompt, system),
             "temperature": temperature,
             "max_tokens": max_tokens
         }
-
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.llm7_base_url}/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=30)
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if 'choices' in data and len(data['choices']) > 0:
-                        return data['choices'][0]['message']['content'].strip()
-                    else:
-                        logger.error(f"Unexpected LLM7 response format: {data}")
-                        return None
+        if response_format:
+            payload["response_format"] = response_format
+
+        session = self._get_session()
+        async with session.post(
+            f"{self.llm7_base_url}/chat/completions",
+            headers=headers,
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=30)
+        ) as response:
+            if response.status == 200:
+                data = await response.json()
+                if 'choices' in data and len(data['choices']) > 0:
+                    return data['choices'][0]['message']['content'].strip()
                 else:
-                    error_text = await response.text()
-                    logger.error(f"LLM7 HTTP error {response.status}: {error_text}")
-                    raise Exception(f"HTTP {response.status}: {error_text}")
+                    logger.error(f"Unexpected LLM7 response format: {data}")
+                    return None
+            else:
+                error_text = await response.text()
+                logger.error(f"LLM7 HTTP error {response.status}: {error_text}")
+                raise Exception(f"HTTP {response.status}: {error_text}")
 
-    async def _call_openai(self, prompt: str, temperature: float, max_tokens: int) -> Optional[str]:
+    async def _call_openai(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        system: Optional[str] = None,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
         """Call OpenAI API"""
         try:
+            extra = {"response_format": response_format} if response_format else {}
             response = await asyncio.to_thread(
                 self.openai_client.chat.completions.create,
                 model=self.fallback_model,
-                messages=[{"role": "user", "content": prompt}],
+                messages=self._build_messages(prompt, system),
                 temperature=temperature,
-                max_tokens=max_tokens
+                max_tokens=max_tokens,
+                **extra
             )
 
             return response.choices[0].message.content.strip()
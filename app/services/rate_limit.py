@@ -0,0 +1,41 @@
+import asyncio
+import threading
+import time
+
+
+class RateLimiter:
+    """Token bucket allowing ``rate`` calls per second with bursts of up to ``burst``.
+
+    Callers reserve a token up front and wait out any deficit, so queued
+    calls are spaced evenly instead of retrying after a 429. Usable from
+    coroutines (``acquire``) and from worker threads (``wait``), and not
+    tied to any event loop.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token and return how long to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self):
+        """Wait asynchronously until a call is allowed"""
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+    def wait(self):
+        """Block the calling thread until a call is allowed"""
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
@@ -13,6 +13,9 @@ class StockListCollector:
         self.stable_stocks = []
         self.risky_stocks = []
         self.last_updated = None
+        
+        # Bumped whenever the lists change so callers can invalidate derived data
+        self.version = 0
     
     async def update_stock_lists(self) -> Dict[str, List[str]]:
         """Update both stable and risky stock lists from internet sources"""
@@ -32,6 +35,7 @@ class StockListCollector:
             self.stable_stocks = stable_stocks[:25]  # Limit to 25 stable
             self.risky_stocks = risky_stocks[:15]   # Limit to 15 risky
             self.last_updated = datetime.now()
+            self.version += 1
             
             logger.info(f"Updated stock lists: {len(self.stable_stocks)} stable, {len(self.risky_stocks)} risky")
             
@@ -280,6 +284,7 @@ class StockListCollector:
             self.stable_stocks = data.get("stable_stocks", [])
             self.risky_stocks = data.get("risky_stocks", [])
             self.last_updated = datetime.fromisoformat(data["last_updated"]) if data.get("last_updated") else None
+            self.version += 1
             
             logger.info(f"Stock lists loaded from {filepath}")
             return True
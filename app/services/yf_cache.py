@@ -0,0 +1,90 @@
+import logging
+import os
+import threading
+import time
+from io import StringIO
+from pathlib import Path
+from typing import Any, Callable
+
+import orjson
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Lives under data/ so the API and Celery containers share it
+CACHE_DIR = Path("data") / ".cache" / "yf"
+
+# Freshness per endpoint, matched to how often Yahoo updates it
+TTL_INFO = 86400  # fundamentals: 24h
+TTL_HISTORY_5D = 900  # quotes: 15 min
+TTL_RECOMMENDATIONS = 604800  # analyst ratings: 7 days
+
+
+def _is_empty(data: Any) -> bool:
+    """Check whether a yfinance result is not worth caching"""
+    if data is None:
+        return True
+    if isinstance(data, pd.DataFrame):
+        return data.empty
+    return not data
+
+
+def _read(path: Path) -> Any:
+    """Load a cache entry, returning None if it is missing or expired"""
+    try:
+        entry = orjson.loads(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable yfinance cache {path}: {str(e)}")
+        return None
+
+    if time.time() - entry["ts"] > entry["ttl"]:
+        return None
+    if entry.get("frame"):
+        return pd.read_json(StringIO(entry["data"]), orient="split")
+    return entry["data"]
+
+
+def _write(path: Path, ttl: int, data: Any):
+    """Store a cache entry atomically so concurrent readers never see a partial file"""
+    is_frame = isinstance(data, pd.DataFrame)
+    entry = {
+        "ts": time.time(),
+        "ttl": ttl,
+        "frame": is_frame,
+        "data": data.to_json(orient="split", date_format="iso") if is_frame else data
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(orjson.dumps(entry, default=str))
+        os.replace(tmp, path)
+    except Exception as e:
+        logger.warning(f"Failed to write yfinance cache {path}: {str(e)}")
+
+
+def load(endpoint: str, symbol: str) -> Any:
+    """Get a fresh cached result for a symbol, or None"""
+    return _read(CACHE_DIR / endpoint / f"{symbol}.json")
+
+
+def store(endpoint: str, symbol: str, ttl: int, data: Any):
+    """Cache a result for a symbol unless it is empty"""
+    if not _is_empty(data):
+        _write(CACHE_DIR / endpoint / f"{symbol}.json", ttl, data)
+
+
+def cached_fetch(endpoint: str, symbol: str, ttl: int, fetch: Callable[[], Any]) -> Any:
+    """Return a fresh cached yfinance result, or call ``fetch`` and cache it.
+
+    Blocking; run it off the event loop. Empty results are not cached so
+    they are retried on the next call.
+    """
+    data = load(endpoint, symbol)
+    if data is not None:
+        return data
+
+    data = fetch()
+    store(endpoint, symbol, ttl, data)
+    return data
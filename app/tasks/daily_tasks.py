@@ -6,9 +6,11 @@ from typing import List
 
 from ..config import settings
 from ..services.data_collector import DataCollector
-from ..services.analyzer import LLMAnalyzer
+from ..services.analyzer import ANALYSIS_BATCH_SIZE, LLMAnalyzer
 from ..services.json_storage import JSONStorage
 from ..services.report_generator import ReportGenerator
+from ..services.llm_adapter import llm_adapter
+from ..services.cache import close_cache
 from ..models.stock_data import StockData
 
 # Configure logging
@@ -60,7 +62,10 @@ def daily_analysis_task(self):
 
             # Collect data for all stocks (this will also update stock lists)
             logger.info("Phase 1: Collecting stock data and updating stock lists...")
-            stock_data = await collector.collect_daily_data()
+            try:
+                stock_data = await collector.collect_daily_data()
+            finally:
+                await collector.close()
 
             # Get the updated watchlist for logging
             watchlist = await collector.get_watchlist()
@@ -72,31 +77,41 @@ def daily_analysis_task(self):
 
             logger.info(f"Successfully collected data for {len(stock_data)} stocks")
 
-            # Analyze each stock with LLM
+            # Analyze stocks with LLM, several per call
             logger.info("Phase 2: Running LLM analysis...")
             analyzed_stocks: List[StockData] = []
 
-            for symbol, data in stock_data.items():
+            stocks = list(stock_data.values())
+            for i in range(0, len(stocks), ANALYSIS_BATCH_SIZE):
+                batch = stocks[i:i + ANALYSIS_BATCH_SIZE]
+                logger.info(f"Analyzing {', '.join(data.symbol for data in batch)}...")
                 try:
-                    logger.info(f"Analyzing {symbol}...")
-                    analysis = await analyzer.analyze_stock_data(data)
+                    analyses = await analyzer.analyze_stock_batch(batch)
+                except Exception as e:
+                    logger.error(f"Batch analysis failed, analyzing individually: {str(e)}")
+                    analyses = {data.symbol: await analyzer.analyze_stock_data(data) for data in batch}
 
-                    if analysis:
-                        data.ai_analysis = analysis
-                        analyzed_stocks.append(data)
+                for data in batch:
+                    symbol = data.symbol
+                    try:
+                        analysis = analyses.get(symbol)
 
-                        # Data is already saved to JSON storage in collect_daily_data
-                        # Just update with AI analysis
-                        await storage.save_stock_data(data)
+                        if analysis:
+                            data.ai_analysis = analysis
+                            analyzed_stocks.append(data)
 
-                        logger.info(f"✓ {symbol}: {analysis.recommendation.value} "
-                                  f"(confidence: {analysis.confidence_level:.2f})")
-                    else:
-                        logger.warning(f"✗ {symbol}: Analysis failed")
+                            # Data is already saved to JSON storage in collect_daily_data
+                            # Just update with AI analysis
+                            await storage.save_stock_data(data)
 
-                except Exception as e:
-                    logger.error(f"Error analyzing {symbol}: {str(e)}")
-                    continue
+                            logger.info(f"✓ {symbol}: {analysis.recommendation.value} "
+                                      f"(confidence: {analysis.confidence_level:.2f})")
+                        else:
+                            logger.warning(f"✗ {symbol}: Analysis failed")
+
+                    except Exception as e:
+                        logger.error(f"Error analyzing {symbol}: {str(e)}")
+                        continue
 
             logger.info(f"Completed analysis for {len(analyzed_stocks)} stocks")
 
@@ -148,6 +163,8 @@ def daily_analysis_task(self):
     try:
         return loop.run_until_complete(run_analysis())
     finally:
+        loop.run_until_complete(llm_adapter.close())
+        loop.run_until_complete(close_cache())
         loop.close()
 
 
@@ -223,6 +240,8 @@ def generate_summary_report_task(self, start_date: str = None, end_date: str = N
     try:
         return loop.run_until_complete(run_summary())
     finally:
+        loop.run_until_complete(llm_adapter.close())
+        loop.run_until_complete(close_cache())
         loop.close()
 
 
@@ -300,6 +319,8 @@ def generate_monthly_summary_report_task(self, months: int = 3):
     try:
         return loop.run_until_complete(run_monthly_summary())
     finally:
+        loop.run_until_complete(llm_adapter.close())
+        loop.run_until_complete(close_cache())
         loop.close()
 
 